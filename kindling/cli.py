@@ -10,7 +10,7 @@ import click
 import yaml
 
 from .generator import Generator
-from .persona_loader import PersonaLoader
+from .persona_loader import default_loader
 from .validator import FHIRValidator
 from .utils.r4_converter import convert_bundle_to_r4
 
@@ -150,8 +150,7 @@ def main(
     """
     # List personas if requested
     if list_personas:
-        loader = PersonaLoader()
-        personas = loader.list_personas()
+        personas = default_loader.list_personas()
         if personas:
             click.echo("Available personas:")
             for p in personas:
@@ -11,6 +11,7 @@ SYSTEMS = {
     "HL7_CONDITION_CLINICAL": "http://terminology.hl7.org/CodeSystem/condition-clinical",
     "HL7_CONDITION_VER_STATUS": "http://terminology.hl7.org/CodeSystem/condition-ver-status",
     "HL7_V3_ACTCODE": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
+    "HL7_V2_DIAGNOSTIC_SERVICE": "http://terminology.hl7.org/CodeSystem/v2-0074",
     "UNITS": "http://unitsofmeasure.org"
 }
 
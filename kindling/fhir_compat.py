@@ -16,7 +16,7 @@ codebase (and downstream callers) have been migrated to the new APIs.
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
 from types import SimpleNamespace
 from typing import Any, Dict
 
@@ -34,6 +34,11 @@ from .config import RESOURCE_DEFAULTS, SYSTEMS
 _PATCHED = False
 
 
+def _iso(value: Any) -> Any:
+    """Return ISO text for ``date``/``datetime`` values, anything else unchanged."""
+    return value.isoformat() if isinstance(value, date) else value
+
+
 def apply_fhir_compatibility_patches() -> None:
     """Apply patches that restore backwards compatibility.
 
@@ -126,8 +131,8 @@ def _patch_patient_birthdate_accessor() -> None:
 
     def _patched_getattribute(self: Patient, name: str) -> Any:
         value = original_getattribute(self, name)
-        if name == "birthDate" and isinstance(value, date):
-            return value.isoformat()
+        if name == "birthDate":
+            return _iso(value)
         return value
 
     Patient.__getattribute__ = _patched_getattribute  # type: ignore[assignment]
@@ -154,10 +159,9 @@ def _patch_encounter_accessors() -> None:
                 return None
 
             data = period.model_dump()
-            if "start" in data and isinstance(data["start"], datetime):
-                data["start"] = data["start"].isoformat()
-            if "end" in data and isinstance(data["end"], datetime):
-                data["end"] = data["end"].isoformat()
+            for key in ("start", "end"):
+                if key in data:
+                    data[key] = _iso(data[key])
 
             return SimpleNamespace(**data)
 
@@ -203,8 +207,8 @@ def _patch_bundle_timestamp_accessor() -> None:
 
     def _patched_getattribute(self: Bundle, name: str) -> Any:
         value = original_getattribute(self, name)
-        if name == "timestamp" and isinstance(value, datetime):
-            return value.isoformat()
+        if name == "timestamp":
+            return _iso(value)
         return value
 
     Bundle.__getattribute__ = _patched_getattribute  # type: ignore[assignment]
@@ -1,21 +1,84 @@
 """Core Generator class for Kindling."""
 
+import functools
+from collections import defaultdict
 from copy import deepcopy
 from datetime import datetime, timedelta
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import (
+    Any, Callable, Dict, Iterable, List, Literal, Mapping, Optional, Union, Tuple, overload
+)
 
 from fhir.resources.bundle import Bundle
 from fhir.resources.patient import Patient
 
 from .bundle_assembler import BundleAssembler
 from .config import DEMOGRAPHICS
-from .persona_loader import PersonaLoader
+from .persona_loader import default_loader
 from .profile_parser import ProfileParser
 from .resource_factory import ResourceFactory
 from .utils.random_utils import SeededRandom
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_condition(condition: str) -> Callable[[Dict[str, Any]], bool]:
+    """Turn a rule ``when.condition`` string into a predicate.
+
+    Conditions are parsed once per distinct string and the resulting
+    predicate is reused for every patient.
+
+    Args:
+        condition: Condition expression from the profile
+
+    Returns:
+        Callable taking the patient context and returning whether the rule applies
+    """
+    # Simple evaluation for now
+    if condition == "true":
+        return lambda context: True
+
+    # Basic age comparison
+    if "age >" in condition:
+        age_threshold = int(condition.split(">")[1].strip())
+        return lambda context: context.get("age", 0) > age_threshold
+
+    return lambda context: False
+
+
+# Per-process generator used by the cohort worker pool
+_worker_generator: Optional["Generator"] = None
+
+
+def _init_worker(profile: Dict[str, Any], resource_filter: Optional[List[str]]) -> None:
+    """Build the generator shared by all patients handled in a worker process."""
+    global _worker_generator
+    _worker_generator = Generator(profile=profile)
+    _worker_generator.resource_filter = resource_filter
+
+
+def _generate_patient_in_worker(
+    task: Tuple[int, Optional[int], str]
+) -> Tuple[List[Any], Dict[str, str]]:
+    """Generate one cohort patient inside a worker process.
+
+    Args:
+        task: Tuple of (patient index, patient seed, request method)
+
+    Returns:
+        Tuple of (resources, urn_mapping)
+    """
+    index, seed, request_method = task
+    generator = _worker_generator
+    if generator is None:
+        raise RuntimeError(
+            "Worker generator is not initialized; use _init_worker as the pool initializer"
+        )
+    generator.rng = SeededRandom(seed)
+    generator.resource_factory.rng = generator.rng
+    return generator._generate_patient(index, request_method)
+
+
 class Generator:
     """Main generator class for creating synthetic FHIR data."""
 
@@ -42,7 +105,7 @@ class Generator:
         self.persona_name = persona
         self.seed = seed
         self.rng = SeededRandom(seed)
-        self.resource_filter = None  # Optional filter for resource types
+        self.resource_filter: Optional[List[str]] = None  # Optional filter for resource types
 
         # Initialize components
         self.resource_factory = ResourceFactory(self.rng)
@@ -50,7 +113,7 @@ class Generator:
 
         # Load persona if specified
         if persona:
-            self.persona_loader = PersonaLoader()
+            self.persona_loader = default_loader
             self.persona_data = self.persona_loader.load(persona)
             # Convert persona to profile format
             self.profile = self._persona_to_profile(self.persona_data)
@@ -85,13 +148,38 @@ class Generator:
         """
         self.resource_filter = resource_types
 
+    @overload
+    def generate(
+        self,
+        count: int = ...,
+        bundle_type: str = ...,
+        bundle_size: int = ...,
+        request_method: str = ...,
+        return_index: Literal[False] = ...,
+        workers: Optional[int] = ...,
+    ) -> Union[Bundle, List[Bundle]]: ...
+
+    @overload
+    def generate(
+        self,
+        count: int = ...,
+        bundle_type: str = ...,
+        bundle_size: int = ...,
+        request_method: str = ...,
+        *,
+        return_index: Literal[True],
+        workers: Optional[int] = ...,
+    ) -> Tuple[Union[Bundle, List[Bundle]], Dict[str, List[Any]]]: ...
+
     def generate(
         self,
         count: int = 1,
         bundle_type: str = "transaction",
         bundle_size: int = 100,
         request_method: str = "POST",
-    ) -> Union[Bundle, List[Bundle]]:
+        return_index: bool = False,
+        workers: Optional[int] = None,
+    ) -> Union[Bundle, List[Bundle], Tuple[Union[Bundle, List[Bundle]], Dict[str, List[Any]]]]:
         """Generate FHIR resources based on profile/persona.
 
         Args:
@@ -99,9 +187,15 @@ class Generator:
             bundle_type: Type of bundle ("transaction" or "collection")
             bundle_size: Maximum resources per bundle
             request_method: HTTP method for transaction bundles ("POST" or "PUT")
+            return_index: Also return the bundled resources grouped by resource type
+            workers: Number of processes used to generate cohort patients. With
+                more than one worker each patient draws from its own seed derived
+                from the generator seed, so output is reproducible for a given
+                seed but differs from sequential generation.
 
         Returns:
-            Single bundle or list of bundles
+            Single bundle or list of bundles, or a (bundles, index) tuple when
+            return_index is set
         """
         mode = self.profile.get("mode", "cohort")
 
@@ -112,13 +206,18 @@ class Generator:
                 resources, bundle_type=bundle_type, request_method=request_method,
                 urn_mapping=urn_mapping
             )
-            return bundle
+            bundles = [bundle]
+            result: Union[Bundle, List[Bundle]] = bundle
         else:
             # Generate cohort
             all_resources = []
             all_urn_mappings = {}
-            for i in range(count):
-                patient_resources, urn_mapping = self._generate_patient(i, request_method)
+            patients: Iterable[Tuple[List[Any], Dict[str, str]]]
+            if workers and workers > 1:
+                patients = self._generate_patients_parallel(count, request_method, workers)
+            else:
+                patients = (self._generate_patient(i, request_method) for i in range(count))
+            for patient_resources, urn_mapping in patients:
                 all_resources.extend(patient_resources)
                 all_urn_mappings.update(urn_mapping)
 
@@ -131,7 +230,48 @@ class Generator:
                 urn_mapping=all_urn_mappings
             )
 
-            return bundles[0] if len(bundles) == 1 else bundles
+            result = bundles[0] if len(bundles) == 1 else bundles
+
+        if return_index:
+            return result, self._index_resources(bundles)
+        return result
+
+    def _generate_patients_parallel(
+        self, count: int, request_method: str, workers: int
+    ) -> List[Tuple[List[Any], Dict[str, str]]]:
+        """Generate cohort patients across a pool of worker processes.
+
+        Args:
+            count: Number of patients to generate
+            request_method: HTTP method for transaction bundles
+            workers: Number of worker processes
+
+        Returns:
+            List of (resources, urn_mapping) tuples in patient order
+        """
+        tasks = [(i, self.rng.spawn(str(i)).seed, request_method) for i in range(count)]
+        chunksize = max(1, count // (workers * 4))
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(self.profile, self.resource_filter)) as pool:
+            return list(pool.imap(_generate_patient_in_worker, tasks, chunksize=chunksize))
+
+    def _index_resources(self, bundles: List[Bundle]) -> Dict[str, List[Any]]:
+        """Group bundled resources by resource type in a single pass.
+
+        Args:
+            bundles: Bundles to index
+
+        Returns:
+            Mapping of resource type to resources, in bundle order
+        """
+        index: Dict[str, List[Any]] = defaultdict(list)
+        for bundle in bundles:
+            for entry in bundle.entry or []:
+                resource = entry.resource
+                if resource is None:
+                    continue
+                index[resource.get_resource_type()].append(resource)
+        return dict(index)
 
     def _generate_single_patient(self, request_method: str = "POST") -> Tuple[List[Any], Dict[str, str]]:
         """Generate resources for a single patient.
@@ -269,17 +409,7 @@ class Generator:
         """Evaluate if a rule condition is met."""
         when = rule.get("when", {})
         condition = when.get("condition", "true")
-
-        # Simple evaluation for now
-        if condition == "true":
-            return True
-
-        # Basic age comparison
-        if "age >" in condition:
-            age_threshold = int(condition.split(">")[1].strip())
-            return context.get("age", 0) > age_threshold
-
-        return False
+        return _compile_condition(condition)(context)
 
     def _apply_rule(self, rule: Dict[str, Any], patient: Patient, patient_ref: str, request_method: str = "POST") -> Tuple[List[Any], Dict[str, str]]:
         """Apply a rule to generate resources.
@@ -612,7 +742,7 @@ class Generator:
 
         return expanded
 
-    def _persona_to_profile(self, persona_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _persona_to_profile(self, persona_data: Mapping[str, Any]) -> Dict[str, Any]:
         """Convert persona data to profile format."""
         return {
             "version": "0.1",
@@ -854,11 +984,8 @@ class Generator:
         if not self.resource_filter:
             return resources
 
-        filtered = []
-        for resource in resources:
-            resource_type = resource.__class__.__name__
-            if resource_type in self.resource_filter:
-                filtered.append(resource)
+        wanted = set(self.resource_filter)
+        filtered = [resource for resource in resources if type(resource).__name__ in wanted]
 
         # Always include Patient if any resources are requested
         # (since other resources reference the Patient)
@@ -1,13 +1,14 @@
 """Loader for built-in personas."""
 
-import json
+import copy
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, List, Mapping
 
-import yaml
 from pydantic import ValidationError
 
 from .schemas import PersonaSchema, format_validation_error
+from .utils import json_utils, yaml_utils
 
 
 class PersonaLoader:
@@ -18,21 +19,26 @@ class PersonaLoader:
         self.personas_dir = Path(__file__).parent / "personas"
         self._personas_cache = {}
 
-    def load(self, persona_name: str) -> Dict[str, Any]:
+    def load(self, persona_name: str) -> Mapping[str, Any]:
         """Load a built-in persona.
 
+        Personas are parsed and validated once, then cached. Each call
+        returns a read-only mapping over its own deep copy of the cached
+        data, so callers cannot alter the cache and nested values may be
+        edited freely.
+
         Args:
             persona_name: Name of the persona to load
 
         Returns:
-            Persona data dictionary
+            Read-only persona data mapping
 
         Raises:
             ValueError: If persona not found
         """
         # Check cache
         if persona_name in self._personas_cache:
-            return self._personas_cache[persona_name]
+            return MappingProxyType(copy.deepcopy(self._personas_cache[persona_name]))
 
         # Look for persona file
         persona_file = self.personas_dir / f"{persona_name}.yaml"
@@ -49,9 +55,9 @@ class PersonaLoader:
         # Load persona data
         with open(persona_file, 'r') as f:
             if persona_file.suffix in ['.yaml', '.yml']:
-                data = yaml.safe_load(f)
+                data = yaml_utils.safe_load(f)
             else:
-                data = json.load(f)
+                data = json_utils.loads(f.read())
 
         # Validate persona structure
         try:
@@ -65,7 +71,7 @@ class PersonaLoader:
 
         # Cache and return
         self._personas_cache[persona_name] = result
-        return result
+        return MappingProxyType(copy.deepcopy(result))
 
     def list_personas(self) -> List[str]:
         """List available personas.
@@ -82,4 +88,8 @@ class PersonaLoader:
                 if file.stem not in personas:
                     personas.append(file.stem)
 
-        return sorted(personas)
\ No newline at end of file
+        return sorted(personas)
+
+
+# Shared loader so each persona file is read and validated once per process
+default_loader = PersonaLoader()
@@ -1,13 +1,15 @@
 """Parser for YAML/JSON profiles."""
 
-import json
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Literal, Union
 
-import yaml
 from pydantic import ValidationError
 
 from .schemas import ProfileSchema, format_validation_error
+from .utils import json_utils, yaml_utils
+
+# Bound once so validation calls go straight to pydantic-core
+_SCHEMA_VALIDATOR = ProfileSchema.__pydantic_validator__
 
 
 class ProfileParser:
@@ -30,18 +32,41 @@ class ProfileParser:
         if not profile_path.exists():
             raise ValueError(f"Profile file not found: {profile_path}")
 
+        fmt: Literal["yaml", "json"]
+        if profile_path.suffix in ['.yaml', '.yml']:
+            fmt = "yaml"
+        elif profile_path.suffix == '.json':
+            fmt = "json"
+        else:
+            raise ValueError(f"Unsupported file format: {profile_path.suffix}")
+
         # Load file content
         with open(profile_path, 'r') as f:
-            if profile_path.suffix in ['.yaml', '.yml']:
-                data = yaml.safe_load(f)
-            elif profile_path.suffix == '.json':
-                data = json.load(f)
-            else:
-                raise ValueError(f"Unsupported file format: {profile_path.suffix}")
+            return self.parse_string(f.read(), fmt)
+
+    def parse_string(self, content: str, fmt: Literal["yaml", "json"]) -> Dict[str, Any]:
+        """Parse profile content that is already in memory.
+
+        Args:
+            content: YAML or JSON profile text
+            fmt: Format of the content ("yaml" or "json")
+
+        Returns:
+            Parsed and validated profile dictionary
+
+        Raises:
+            ValueError: If the format is unsupported or the profile is invalid
+        """
+        if fmt == "yaml":
+            data = yaml_utils.safe_load(content)
+        elif fmt == "json":
+            data = json_utils.loads(content)
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
 
         # Validate profile
         try:
-            profile = ProfileSchema(**data)
+            profile = _SCHEMA_VALIDATOR.validate_python(data)
         except ValidationError as e:
             raise ValueError(f"Invalid profile:\n{format_validation_error(e)}")
 
@@ -60,7 +85,7 @@ class ProfileParser:
             ValueError: If profile is invalid
         """
         try:
-            ProfileSchema(**profile_dict)
+            _SCHEMA_VALIDATOR.validate_python(profile_dict)
             return True
         except ValidationError as e:
             raise ValueError(f"Invalid profile:\n{format_validation_error(e)}")
\ No newline at end of file
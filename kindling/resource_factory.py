@@ -1,30 +1,23 @@
 """Factory for creating FHIR resources."""
 
+from __future__ import annotations
+
+import functools
+import importlib
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from fhir.resources.address import Address
 from fhir.resources.codeableconcept import CodeableConcept
 from fhir.resources.codeablereference import CodeableReference
 from fhir.resources.coding import Coding
-from fhir.resources.condition import Condition
 from fhir.resources.contactpoint import ContactPoint
-from fhir.resources.encounter import Encounter
 from fhir.resources.humanname import HumanName
 from fhir.resources.identifier import Identifier
-from fhir.resources.medicationrequest import MedicationRequest
 from fhir.resources.dosage import Dosage
-from fhir.resources.observation import Observation
-from fhir.resources.patient import Patient
 from fhir.resources.period import Period
 from fhir.resources.quantity import Quantity
 from fhir.resources.reference import Reference
-from fhir.resources.relatedperson import RelatedPerson
-from fhir.resources.diagnosticreport import DiagnosticReport
-from fhir.resources.immunization import Immunization
-from fhir.resources.coverage import Coverage
-from fhir.resources.allergyintolerance import AllergyIntolerance
-from fhir.resources.medicationstatement import MedicationStatement
 
 from .config import (
     SYSTEMS,
@@ -36,6 +29,66 @@ from .config import (
 )
 from .utils.random_utils import SeededRandom
 
+if TYPE_CHECKING:
+    from fhir.resources.allergyintolerance import AllergyIntolerance
+    from fhir.resources.condition import Condition
+    from fhir.resources.coverage import Coverage
+    from fhir.resources.diagnosticreport import DiagnosticReport
+    from fhir.resources.encounter import Encounter
+    from fhir.resources.immunization import Immunization
+    from fhir.resources.medicationrequest import MedicationRequest
+    from fhir.resources.medicationstatement import MedicationStatement
+    from fhir.resources.observation import Observation
+    from fhir.resources.patient import Patient
+    from fhir.resources.relatedperson import RelatedPerson
+
+
+@functools.lru_cache(maxsize=None)
+def _fhir_cls(name: str) -> Any:
+    """Import a FHIR resource class on first use.
+
+    Resource modules are heavy to import, so they are only loaded once a
+    profile actually asks for that resource type.
+
+    Args:
+        name: Resource class name, e.g. "DiagnosticReport"
+
+    Returns:
+        The ``fhir.resources`` class of that name
+    """
+    module = importlib.import_module(f"fhir.resources.{name.lower()}")
+    return getattr(module, name)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_codeable_concept(
+    system: Optional[str], code: Any, display: Optional[str]
+) -> CodeableConcept:
+    """Validate a single-coding CodeableConcept once per distinct code."""
+    return CodeableConcept(coding=[Coding(system=system, code=code, display=display)])
+
+
+def _codeable_concept(system: Optional[str], code: Any, display: Optional[str]) -> CodeableConcept:
+    """Build a single-coding CodeableConcept, validating repeated codes once.
+
+    Profiles reuse the same vaccine, site, route and coverage codes across
+    many resources. Each distinct code is validated once and every caller
+    gets its own copy, which is cheaper than re-validating and keeps
+    resources independent of each other.
+
+    Args:
+        system: Code system URI
+        code: Code value
+        display: Display text
+
+    Returns:
+        CodeableConcept with one Coding
+    """
+    source = _cached_codeable_concept(system, code, display)
+    # Coding only holds primitives, so copying it and the list is a full copy
+    codings = [coding.model_copy() for coding in source.coding or []]
+    return source.model_copy(update={"coding": codings})
+
 
 class ResourceFactory:
     """Factory for creating FHIR resources."""
@@ -157,7 +210,7 @@ class ResourceFactory:
                 )
 
         # Create patient
-        patient = Patient(
+        patient = _fhir_cls("Patient")(
             id=patient_id,
             identifier=identifiers,
             name=[name],
@@ -208,7 +261,7 @@ class ResourceFactory:
             onset_date = datetime.now() - timedelta(days=365)  # Default 1 year ago
 
         # Create condition
-        condition = Condition(
+        condition = _fhir_cls("Condition")(
             id=condition_id,
             clinicalStatus=CodeableConcept(
                 coding=[
@@ -357,7 +410,7 @@ class ResourceFactory:
                     code=unit,
                 )
 
-        observation = Observation(**kwargs)
+        observation = _fhir_cls("Observation")(**kwargs)
         return observation
 
     def create_medication_request(
@@ -409,7 +462,7 @@ class ResourceFactory:
         )
 
         # Create medication request
-        med_request = MedicationRequest(
+        med_request = _fhir_cls("MedicationRequest")(
             id=med_request_id,
             status=medication_def.get("status", RESOURCE_DEFAULTS["MEDICATION_REQUEST_STATUS"]),
             intent=medication_def.get("intent", RESOURCE_DEFAULTS["MEDICATION_REQUEST_INTENT"]),
@@ -564,7 +617,7 @@ class ResourceFactory:
             kwargs["serviceProvider"] = Reference(reference=service_provider)
 
         # Create encounter
-        encounter = Encounter(**kwargs)
+        encounter = _fhir_cls("Encounter")(**kwargs)
 
         return encounter
 
@@ -672,7 +725,7 @@ class ResourceFactory:
         if telecom:
             kwargs["telecom"] = telecom
 
-        related_person = RelatedPerson(**kwargs)
+        related_person = _fhir_cls("RelatedPerson")(**kwargs)
 
         return related_person
 
@@ -714,30 +767,25 @@ class ResourceFactory:
         category_data = diagnostic_report_def.get("category", {})
         if category_data:
             category_coding = Coding(
-                system=category_data.get("system", "http://terminology.hl7.org/CodeSystem/v2-0074"),
+                system=category_data.get("system", SYSTEMS["HL7_V2_DIAGNOSTIC_SERVICE"]),
                 code=category_data.get("code", "LAB"),
                 display=category_data.get("display", "Laboratory")
             )
             category = [CodeableConcept(coding=[category_coding])]
         else:
             # Default to LAB category
-            category = [CodeableConcept(
-                coding=[Coding(
-                    system="http://terminology.hl7.org/CodeSystem/v2-0074",
-                    code="LAB",
-                    display="Laboratory"
-                )]
-            )]
+            category = [
+                _codeable_concept(SYSTEMS["HL7_V2_DIAGNOSTIC_SERVICE"], "LAB", "Laboratory")
+            ]
 
         # Generate issued date
         days_ago = diagnostic_report_def.get("days_ago", self.rng.randint(1, 30))
         issued_date = datetime.now() - timedelta(days=days_ago)
 
         # Build result references if provided
-        result_refs = []
-        if observation_refs:
-            for obs_ref in observation_refs:
-                result_refs.append(Reference(reference=obs_ref))
+        result_refs = [
+            Reference(reference=obs_ref) for obs_ref in observation_refs or []
+        ]
 
         # Create conclusion text if provided
         conclusion = diagnostic_report_def.get("conclusion")
@@ -773,7 +821,7 @@ class ResourceFactory:
         if performer := diagnostic_report_def.get("performer"):
             kwargs["performer"] = [Reference(reference=performer)]
 
-        diagnostic_report = DiagnosticReport(**kwargs)
+        diagnostic_report = _fhir_cls("DiagnosticReport")(**kwargs)
 
         return diagnostic_report
 
@@ -799,10 +847,10 @@ class ResourceFactory:
 
         # Extract vaccine code (CVX or other coding system)
         vaccine_data = immunization_def.get("vaccine", {})
-        vaccine_coding = Coding(
-            system=vaccine_data.get("system", "http://hl7.org/fhir/sid/cvx"),
-            code=vaccine_data.get("code"),
-            display=vaccine_data.get("display")
+        vaccine_code = _codeable_concept(
+            vaccine_data.get("system", "http://hl7.org/fhir/sid/cvx"),
+            vaccine_data.get("code"),
+            vaccine_data.get("display")
         )
 
         # Status - default to completed
@@ -816,7 +864,7 @@ class ResourceFactory:
         kwargs = {
             "id": immunization_id,
             "status": status,
-            "vaccineCode": CodeableConcept(coding=[vaccine_coding]),
+            "vaccineCode": vaccine_code,
             "patient": Reference(reference=patient_ref or f"Patient/{patient_id}"),
             "occurrenceDateTime": occurrence_date.strftime("%Y-%m-%dT%H:%M:%S+00:00")
         }
@@ -829,20 +877,18 @@ class ResourceFactory:
             kwargs["lotNumber"] = lot_number
 
         if site := immunization_def.get("site"):
-            site_coding = Coding(
-                system="http://terminology.hl7.org/CodeSystem/v3-ActSite",
-                code=site.get("code") if isinstance(site, dict) else site,
-                display=site.get("display") if isinstance(site, dict) else None
+            kwargs["site"] = _codeable_concept(
+                "http://terminology.hl7.org/CodeSystem/v3-ActSite",
+                site.get("code") if isinstance(site, dict) else site,
+                site.get("display") if isinstance(site, dict) else None
             )
-            kwargs["site"] = CodeableConcept(coding=[site_coding])
 
         if route := immunization_def.get("route"):
-            route_coding = Coding(
-                system="http://terminology.hl7.org/CodeSystem/v3-RouteOfAdministration",
-                code=route.get("code") if isinstance(route, dict) else route,
-                display=route.get("display") if isinstance(route, dict) else None
+            kwargs["route"] = _codeable_concept(
+                "http://terminology.hl7.org/CodeSystem/v3-RouteOfAdministration",
+                route.get("code") if isinstance(route, dict) else route,
+                route.get("display") if isinstance(route, dict) else None
             )
-            kwargs["route"] = CodeableConcept(coding=[route_coding])
 
         if performer := immunization_def.get("performer"):
             from fhir.resources.immunization import ImmunizationPerformer
@@ -851,7 +897,7 @@ class ResourceFactory:
         if not_given := immunization_def.get("notGiven"):
             kwargs["primarySource"] = not not_given  # If not given, primarySource is False
 
-        immunization = Immunization(**kwargs)
+        immunization = _fhir_cls("Immunization")(**kwargs)
 
         return immunization
 
@@ -881,20 +927,10 @@ class ResourceFactory:
         # Type of coverage
         type_data = coverage_def.get("type", {})
         if type_data:
-            type_coding = Coding(
-                system=type_data.get("system", "http://terminology.hl7.org/CodeSystem/v3-ActCode"),
-                code=type_data.get("code", "EHCPOL"),
-                display=type_data.get("display", "Extended healthcare")
-            )
-            coverage_type = CodeableConcept(coding=[type_coding])
-        else:
-            # Default to general health insurance
-            coverage_type = CodeableConcept(
-                coding=[Coding(
-                    system="http://terminology.hl7.org/CodeSystem/v3-ActCode",
-                    code="EHCPOL",
-                    display="Extended healthcare"
-                )]
+            coverage_type = _codeable_concept(
+                type_data.get("system", SYSTEMS["HL7_V3_ACTCODE"]),
+                type_data.get("code", "EHCPOL"),
+                type_data.get("display", "Extended healthcare")
             )
 
         # Build the Coverage resource
@@ -959,14 +995,13 @@ class ResourceFactory:
 
         # Add relationship if provided
         if relationship := coverage_def.get("relationship"):
-            rel_coding = Coding(
-                system="http://terminology.hl7.org/CodeSystem/subscriber-relationship",
-                code=relationship if isinstance(relationship, str) else relationship.get("code"),
-                display=relationship.get("display") if isinstance(relationship, dict) else None
+            kwargs["relationship"] = _codeable_concept(
+                "http://terminology.hl7.org/CodeSystem/subscriber-relationship",
+                relationship if isinstance(relationship, str) else relationship.get("code"),
+                relationship.get("display") if isinstance(relationship, dict) else None
             )
-            kwargs["relationship"] = CodeableConcept(coding=[rel_coding])
 
-        coverage = Coverage(**kwargs)
+        coverage = _fhir_cls("Coverage")(**kwargs)
 
         return coverage
 
@@ -1048,7 +1083,7 @@ class ResourceFactory:
         if category := allergy_def.get("category"):
             kwargs["category"] = category if isinstance(category, list) else [category]
 
-        allergy = AllergyIntolerance(**kwargs)
+        allergy = _fhir_cls("AllergyIntolerance")(**kwargs)
         return allergy
 
     def create_medication_statement(
@@ -1101,5 +1136,5 @@ class ResourceFactory:
             end = effective_period.get("end")
             kwargs["effectivePeriod"] = Period(start=start, end=end)
 
-        med_statement = MedicationStatement(**kwargs)
+        med_statement = _fhir_cls("MedicationStatement")(**kwargs)
         return med_statement
\ No newline at end of file
@@ -1,8 +1,10 @@
 """Random utilities for deterministic generation."""
 
+import hashlib
 import random
 import uuid
-from typing import Any, Dict, List, Optional, TypeVar
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
 T = TypeVar('T')
 
@@ -19,6 +21,40 @@ class SeededRandom:
         self.seed = seed
         self.rng = random.Random(seed)
 
+    def get_state(self) -> Tuple[Any, ...]:
+        """Snapshot the generator state.
+
+        Returns:
+            Opaque state object to pass to ``set_state``
+        """
+        return self.rng.getstate()
+
+    def set_state(self, state: Tuple[Any, ...]) -> None:
+        """Restore a state captured with ``get_state``.
+
+        Args:
+            state: State returned by ``get_state``
+        """
+        self.rng.setstate(state)
+
+    def spawn(self, tag: str) -> "SeededRandom":
+        """Create an independent generator for a named substream.
+
+        The child seed depends only on this generator's seed and the tag, not
+        on how many values have been drawn, so substreams stay reproducible
+        regardless of generation order.
+
+        Args:
+            tag: Name of the substream, e.g. a patient index or resource type
+
+        Returns:
+            New SeededRandom (unseeded if this generator is unseeded)
+        """
+        if self.seed is None:
+            return SeededRandom()
+        digest = hashlib.sha256(f"{self.seed}:{tag}".encode()).digest()
+        return SeededRandom(int.from_bytes(digest[:8], "big"))
+
     def randint(self, a: int, b: int) -> int:
         """Generate random integer between a and b inclusive."""
         return self.rng.randint(a, b)
@@ -58,8 +94,9 @@ class SeededRandom:
 
     def uuid(self) -> str:
         """Generate deterministic UUID."""
-        # Use random bytes for deterministic UUID
-        bytes_data = bytes([self.rng.randint(0, 255) for _ in range(16)])
+        # Use random bytes for deterministic UUID; randrange(256) draws the
+        # same values as randint(0, 255) without the extra call overhead.
+        bytes_data = bytes(map(self.rng.randrange, repeat(256, 16)))
         return str(uuid.UUID(bytes=bytes_data))
 
     def boolean(self, probability: float = 0.5) -> bool:
@@ -0,0 +1,20 @@
+"""YAML helpers that use the libyaml bindings when PyYAML was built with them."""
+
+from typing import IO, Any, Union
+
+import yaml
+
+# libyaml-backed loader is much faster; both only construct plain Python types
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load(stream: Union[str, IO[str]]) -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: YAML text or open text stream
+
+    Returns:
+        Parsed document
+    """
+    return yaml.load(stream, Loader=SafeLoader)
@@ -0,0 +1,122 @@
+"""Shared pytest fixtures and helpers."""
+
+import operator
+import os
+from collections import defaultdict
+from datetime import datetime
+from multiprocessing import Pool
+
+import pytest
+
+from kindling import resource_factory
+from kindling.generator import Generator
+from kindling.resource_factory import ResourceFactory, _fhir_cls
+from kindling.utils.random_utils import SeededRandom
+
+# Import every resource class the factory builds at collection time, so the
+# fhir.resources model import cost is paid once instead of by whichever test
+# first generates that resource type
+for _resource_type in (
+    "Patient", "Condition", "Observation", "MedicationRequest", "Encounter",
+    "RelatedPerson", "DiagnosticReport", "Immunization", "Coverage",
+    "AllergyIntolerance", "MedicationStatement",
+):
+    _fhir_cls(_resource_type)
+
+get_resource = operator.attrgetter("resource")
+get_resource_type = operator.attrgetter("resource_type")
+
+
+def bucket(bundle):
+    """Group a bundle's resources by resource type in a single pass."""
+    buckets = defaultdict(list)
+    for resource in map(get_resource, bundle.entry):
+        buckets[get_resource_type(resource)].append(resource)
+    return buckets
+
+
+def to_datetime(value):
+    """Parse a FHIR dateTime (ISO string or datetime), keeping its UTC offset."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+@pytest.fixture(scope="session")
+def _session_factory():
+    """Build one seeded ResourceFactory for the whole test session."""
+    factory = ResourceFactory(SeededRandom(42))
+    return factory, factory.rng.get_state()
+
+
+@pytest.fixture
+def factory(_session_factory):
+    """Shared ResourceFactory whose RNG is rewound to a fresh seed-42 state."""
+    factory, initial_state = _session_factory
+    factory.rng.set_state(initial_state)
+    return factory
+
+
+# Wall-clock time seen by the factory under the frozen_now fixture
+FROZEN_NOW = datetime(2024, 1, 15, 9, 30)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() always returns FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW.replace(tzinfo=tz)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze datetime.now() inside the resource factory at FROZEN_NOW."""
+    monkeypatch.setattr(resource_factory, "datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
+@pytest.fixture
+def fresh_rng(factory):
+    """Factory RNG that is rewound to its entry state after the test."""
+    state = factory.rng.get_state()
+    yield factory.rng
+    factory.rng.set_state(state)
+
+
+# Persona bundles shared read-only across the suite: name -> (seed, request method)
+PERSONA_BUNDLES = {
+    "grace_tb": (None, "PUT"),
+    "mary_diabetes": (42, "POST"),
+    "john_asthma": (42, "POST"),
+    "linda_hypertension": (42, "POST"),
+}
+
+
+def _generate_persona(name):
+    """Generate one shared persona bundle (runs in a worker process)."""
+    seed, request_method = PERSONA_BUNDLES[name]
+    return name, Generator.from_persona(name, seed=seed).generate(request_method=request_method)
+
+
+@pytest.fixture(scope="session")
+def persona_bundles():
+    """Bundles for PERSONA_BUNDLES, generated once per session.
+
+    Personas are independent, so they are generated in parallel when more
+    than one CPU is available, unless this is a pytest-xdist worker (the
+    cores are already busy with other workers). Tests must treat the
+    bundles as read-only.
+    """
+    names = list(PERSONA_BUNDLES)
+    workers = 1 if "PYTEST_XDIST_WORKER" in os.environ else min(len(names), os.cpu_count() or 1)
+    if workers > 1:
+        with Pool(workers) as pool:
+            return dict(pool.imap_unordered(_generate_persona, names))
+    return dict(map(_generate_persona, names))
+
+
+@pytest.fixture(scope="session")
+def persona_buckets(persona_bundles):
+    """Resources of each PERSONA_BUNDLES bundle grouped by type, built once."""
+    return {name: bucket(bundle) for name, bundle in persona_bundles.items()}
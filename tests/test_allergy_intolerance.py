@@ -4,18 +4,12 @@ import pytest
 from fhir.resources.allergyintolerance import AllergyIntolerance
 
 from kindling import Generator
-from kindling.resource_factory import ResourceFactory
-from kindling.utils.random_utils import SeededRandom
 
 
 class TestAllergyIntoleranceFactory:
     """Test AllergyIntolerance creation in ResourceFactory."""
 
-    def setup_method(self):
-        self.rng = SeededRandom(42)
-        self.factory = ResourceFactory(self.rng)
-
-    def test_create_allergy_intolerance(self):
+    def test_create_allergy_intolerance(self, factory):
         """Should create a valid AllergyIntolerance resource."""
         allergy_def = {
             "code": {
@@ -27,7 +21,7 @@ class TestAllergyIntoleranceFactory:
             "type": "allergy",
         }
 
-        allergy = self.factory.create_allergy_intolerance(
+        allergy = factory.create_allergy_intolerance(
             patient_id="patient-1",
             allergy_def=allergy_def,
             allergy_id="allergy-1",
@@ -40,7 +34,7 @@ class TestAllergyIntoleranceFactory:
         assert allergy.patient.reference == "Patient/patient-1"
         assert allergy.clinicalStatus.coding[0].code == "active"
 
-    def test_create_allergy_with_patient_ref(self):
+    def test_create_allergy_with_patient_ref(self, factory):
         """Should use custom patient reference when provided."""
         allergy_def = {
             "code": {
@@ -52,7 +46,7 @@ class TestAllergyIntoleranceFactory:
             "type": "allergy",
         }
 
-        allergy = self.factory.create_allergy_intolerance(
+        allergy = factory.create_allergy_intolerance(
             patient_id="patient-1",
             allergy_def=allergy_def,
             patient_ref="urn:uuid:abc-123",
@@ -113,7 +107,7 @@ class TestAllergyIntoleranceGenerator:
         allergies = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "AllergyIntolerance"
+            if type(e.resource) is AllergyIntolerance
         ]
 
         assert len(allergies) == 2
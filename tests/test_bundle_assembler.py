@@ -1,7 +1,6 @@
 """Tests for bundle assembler module."""
 
 import uuid
-from datetime import datetime
 
 import pytest
 from fhir.resources.bundle import Bundle
@@ -11,7 +10,8 @@ from fhir.resources.observation import Observation
 from fhir.resources.reference import Reference
 
 from kindling.bundle_assembler import BundleAssembler
-from kindling.utils.random_utils import SeededRandom
+
+from .conftest import to_datetime
 
 
 class TestBundleAssembler:
@@ -20,7 +20,6 @@ class TestBundleAssembler:
     def setup_method(self):
         """Set up test fixtures."""
         self.assembler = BundleAssembler()
-        self.rng = SeededRandom(42)
 
         # Create sample resources
         self.patient = Patient(
@@ -217,7 +216,7 @@ class TestBundleAssembler:
         timestamp = bundle.timestamp
         assert isinstance(timestamp, str)
         # Should parse as datetime
-        datetime.fromisoformat(timestamp.replace('+00:00', ''))
+        to_datetime(timestamp)
 
     def test_preserve_resource_attributes(self):
         """Test that resource attributes are preserved in bundle."""
@@ -238,4 +237,4 @@ class TestBundleAssembler:
         assert bundled_patient.gender == "female"
         assert bundled_patient.birthDate == "1985-06-15"
         assert bundled_patient.name[0].given[0] == "Jane"
-        assert bundled_patient.telecom[0].value == "555-1234"
\ No newline at end of file
+        assert bundled_patient.telecom[0].value == "555-1234"
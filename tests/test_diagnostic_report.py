@@ -1,12 +1,15 @@
 """Tests for DiagnosticReport functionality."""
 
 import pytest
+from pydantic import ValidationError
 from kindling.resource_factory import ResourceFactory
 from kindling.generator import Generator
 from kindling.utils.random_utils import SeededRandom
 from fhir.resources.diagnosticreport import DiagnosticReport
 from fhir.resources.observation import Observation
 
+from .conftest import bucket
+
 
 class TestDiagnosticReportFactory:
     """Test DiagnosticReport factory methods."""
@@ -97,6 +100,35 @@ class TestDiagnosticReportFactory:
         assert report.category[0].coding[0].display == "Radiology"
         assert report.status == "preliminary"
 
+    def test_default_lab_category_not_aliased(self):
+        """Test that reports without a category get independent LAB concepts."""
+        factory = ResourceFactory(SeededRandom(42))
+        report_def = {"code": {"value": "24323-8", "display": "Comprehensive metabolic panel"}}
+
+        first = factory.create_diagnostic_report(
+            patient_id="p-1", diagnostic_report_def=report_def
+        )
+        second = factory.create_diagnostic_report(
+            patient_id="p-2", diagnostic_report_def=report_def
+        )
+        first.category[0].coding[0].display = "changed"
+
+        assert first.category[0] is not second.category[0]
+        assert second.category[0].coding[0].display == "Laboratory"
+        assert first.category[0].coding[0].system == "http://terminology.hl7.org/CodeSystem/v2-0074"
+
+    def test_invalid_report_def_is_rejected(self):
+        """Test that invalid status and effective dates fail validation."""
+        factory = ResourceFactory(SeededRandom(42))
+        report_def = {
+            "code": {"value": "24323-8", "display": "Comprehensive metabolic panel"},
+            "status": "bogus",
+            "effectiveDateTime": "not-a-date",
+        }
+
+        with pytest.raises(ValidationError):
+            factory.create_diagnostic_report(patient_id="p-1", diagnostic_report_def=report_def)
+
 
 class TestDiagnosticReportGeneration:
     """Test DiagnosticReport generation in Generator."""
@@ -151,13 +183,11 @@ class TestDiagnosticReportGeneration:
         }
 
         generator = Generator(profile=profile, seed=42)
-        bundle = generator.generate(request_method="PUT")
+        bundle, resources_by_type = generator.generate(request_method="PUT", return_index=True)
 
-        # Extract resources
-        resources = [entry.resource for entry in bundle.entry]
-        patients = [r for r in resources if r.resource_type == "Patient"]
-        reports = [r for r in resources if r.resource_type == "DiagnosticReport"]
-        observations = [r for r in resources if r.resource_type == "Observation"]
+        patients = resources_by_type["Patient"]
+        reports = resources_by_type["DiagnosticReport"]
+        observations = resources_by_type["Observation"]
 
         assert len(patients) == 1
         assert len(reports) == 1
@@ -170,8 +200,9 @@ class TestDiagnosticReportGeneration:
         assert len(report.result) == 2  # Should reference 2 observations
 
         # Check observations
-        glucose_obs = [o for o in observations if o.code.coding[0].code == "2345-7"][0]
-        creatinine_obs = [o for o in observations if o.code.coding[0].code == "2160-0"][0]
+        obs_by_code = {o.code.coding[0].code: o for o in observations}
+        glucose_obs = obs_by_code["2345-7"]
+        creatinine_obs = obs_by_code["2160-0"]
 
         assert glucose_obs.code.coding[0].display == "Glucose"
         assert creatinine_obs.code.coding[0].display == "Creatinine"
@@ -223,15 +254,14 @@ class TestDiagnosticReportGeneration:
         generator = Generator(profile=profile, seed=42)
         bundle = generator.generate(request_method="PUT")
 
-        # Extract resources
-        resources = [entry.resource for entry in bundle.entry]
-        reports = [r for r in resources if r.resource_type == "DiagnosticReport"]
+        reports = bucket(bundle)["DiagnosticReport"]
 
         assert len(reports) == 2
 
         # Check both reports exist
-        cmp_report = [r for r in reports if r.code.coding[0].code == "24323-8"][0]
-        lipid_report = [r for r in reports if r.code.coding[0].code == "24331-1"][0]
+        reports_by_code = {r.code.coding[0].code: r for r in reports}
+        cmp_report = reports_by_code["24323-8"]
+        lipid_report = reports_by_code["24331-1"]
 
         assert cmp_report.code.coding[0].display == "CMP"
         assert lipid_report.code.coding[0].display == "Lipid panel"
@@ -1,26 +1,21 @@
 """Tests for encounter linking - clinical resources should reference their encounters."""
 
-from datetime import datetime, timedelta
-
 import pytest
+from fhir.resources.encounter import Encounter
 from fhir.resources.observation import Observation
 from fhir.resources.condition import Condition
 from fhir.resources.medicationrequest import MedicationRequest
 from fhir.resources.diagnosticreport import DiagnosticReport
 
 from kindling import Generator
-from kindling.resource_factory import ResourceFactory
-from kindling.utils.random_utils import SeededRandom
+
+from .conftest import to_datetime
 
 
 class TestResourceFactoryEncounterRef:
     """Test that resource factory methods accept and use encounter_ref."""
 
-    def setup_method(self):
-        self.rng = SeededRandom(42)
-        self.factory = ResourceFactory(self.rng)
-
-    def test_observation_includes_encounter_reference(self):
+    def test_observation_includes_encounter_reference(self, factory):
         """Observation should have encounter field when encounter_ref is provided."""
         obs_def = {
             "loinc": "8480-6",
@@ -29,7 +24,7 @@ class TestResourceFactoryEncounterRef:
             "unit": "mmHg",
         }
 
-        observation = self.factory.create_observation(
+        observation = factory.create_observation(
             patient_id="patient-1",
             observation_def=obs_def,
             observation_id="obs-1",
@@ -40,7 +35,7 @@ class TestResourceFactoryEncounterRef:
         assert observation.encounter is not None
         assert observation.encounter.reference == "Encounter/enc-1"
 
-    def test_observation_without_encounter_ref_has_no_encounter(self):
+    def test_observation_without_encounter_ref_has_no_encounter(self, factory):
         """Observation should have no encounter field when encounter_ref is not provided."""
         obs_def = {
             "loinc": "8480-6",
@@ -49,14 +44,14 @@ class TestResourceFactoryEncounterRef:
             "unit": "mmHg",
         }
 
-        observation = self.factory.create_observation(
+        observation = factory.create_observation(
             patient_id="patient-1",
             observation_def=obs_def,
         )
 
         assert observation.encounter is None
 
-    def test_condition_includes_encounter_reference(self):
+    def test_condition_includes_encounter_reference(self, factory):
         """Condition should have encounter field when encounter_ref is provided."""
         condition_def = {
             "code": {
@@ -67,7 +62,7 @@ class TestResourceFactoryEncounterRef:
             "onset": {"years_ago": 5},
         }
 
-        condition = self.factory.create_condition(
+        condition = factory.create_condition(
             patient_id="patient-1",
             condition_def=condition_def,
             condition_id="cond-1",
@@ -78,7 +73,7 @@ class TestResourceFactoryEncounterRef:
         assert condition.encounter is not None
         assert condition.encounter.reference == "Encounter/enc-1"
 
-    def test_medication_request_includes_encounter_reference(self):
+    def test_medication_request_includes_encounter_reference(self, factory):
         """MedicationRequest should have encounter field when encounter_ref is provided."""
         med_def = {
             "rxnorm": "314077",
@@ -87,7 +82,7 @@ class TestResourceFactoryEncounterRef:
             "frequency": 1,
         }
 
-        med = self.factory.create_medication_request(
+        med = factory.create_medication_request(
             patient_id="patient-1",
             medication_def=med_def,
             medication_id="med-1",
@@ -98,7 +93,7 @@ class TestResourceFactoryEncounterRef:
         assert med.encounter is not None
         assert med.encounter.reference == "Encounter/enc-1"
 
-    def test_diagnostic_report_includes_encounter_reference(self):
+    def test_diagnostic_report_includes_encounter_reference(self, factory):
         """DiagnosticReport should have encounter field when encounter_ref is provided."""
         report_def = {
             "code": {
@@ -113,7 +108,7 @@ class TestResourceFactoryEncounterRef:
             },
         }
 
-        report = self.factory.create_diagnostic_report(
+        report = factory.create_diagnostic_report(
             patient_id="patient-1",
             diagnostic_report_def=report_def,
             report_id="report-1",
@@ -128,21 +123,11 @@ class TestResourceFactoryEncounterRef:
 class TestGeneratorEncounterLinking:
     """Test that the generator links clinical resources to encounters."""
 
-    def test_linda_observations_have_encounter_refs(self):
+    def test_linda_observations_have_encounter_refs(self, persona_buckets):
         """Observations in linda_hypertension should reference encounters."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
-
-        observations = [
-            e.resource
-            for e in bundle.entry
-            if e.resource.resource_type == "Observation"
-        ]
-        encounters = [
-            e.resource
-            for e in bundle.entry
-            if e.resource.resource_type == "Encounter"
-        ]
+        buckets = persona_buckets["linda_hypertension"]
+        observations = buckets["Observation"]
+        encounters = buckets["Encounter"]
 
         assert len(encounters) > 0, "Should have encounters"
         assert len(observations) > 0, "Should have observations"
@@ -154,16 +139,9 @@ class TestGeneratorEncounterLinking:
                 f"should reference an encounter"
             )
 
-    def test_linda_conditions_have_encounter_refs(self):
+    def test_linda_conditions_have_encounter_refs(self, persona_buckets):
         """Conditions in linda_hypertension should reference encounters."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
-
-        conditions = [
-            e.resource
-            for e in bundle.entry
-            if e.resource.resource_type == "Condition"
-        ]
+        conditions = persona_buckets["linda_hypertension"]["Condition"]
 
         assert len(conditions) > 0
         for cond in conditions:
@@ -171,16 +149,9 @@ class TestGeneratorEncounterLinking:
                 f"Condition {cond.id} should reference an encounter"
             )
 
-    def test_linda_medication_requests_have_encounter_refs(self):
+    def test_linda_medication_requests_have_encounter_refs(self, persona_buckets):
         """MedicationRequests in linda_hypertension should reference encounters."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
-
-        meds = [
-            e.resource
-            for e in bundle.entry
-            if e.resource.resource_type == "MedicationRequest"
-        ]
+        meds = persona_buckets["linda_hypertension"]["MedicationRequest"]
 
         assert len(meds) > 0
         for med in meds:
@@ -188,16 +159,9 @@ class TestGeneratorEncounterLinking:
                 f"MedicationRequest {med.id} should reference an encounter"
             )
 
-    def test_linda_diagnostic_reports_have_encounter_refs(self):
+    def test_linda_diagnostic_reports_have_encounter_refs(self, persona_buckets):
         """DiagnosticReports in linda_hypertension should reference encounters."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
-
-        reports = [
-            e.resource
-            for e in bundle.entry
-            if e.resource.resource_type == "DiagnosticReport"
-        ]
+        reports = persona_buckets["linda_hypertension"]["DiagnosticReport"]
 
         assert len(reports) > 0
         for report in reports:
@@ -205,15 +169,14 @@ class TestGeneratorEncounterLinking:
                 f"DiagnosticReport {report.id} should reference an encounter"
             )
 
-    def test_encounter_refs_point_to_valid_encounters(self):
+    def test_encounter_refs_point_to_valid_encounters(self, persona_bundles):
         """All encounter references should point to encounters in the bundle."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
+        bundle = persona_bundles["linda_hypertension"]
 
         # Collect all encounter URNs/IDs from bundle entries
         encounter_urls = set()
         for entry in bundle.entry:
-            if entry.resource.resource_type == "Encounter":
+            if type(entry.resource) is Encounter:
                 # In transaction bundles, fullUrl is the URN
                 encounter_urls.add(entry.fullUrl)
 
@@ -228,20 +191,19 @@ class TestGeneratorEncounterLinking:
                     f"{ref_value} which is not in the bundle"
                 )
 
-    def test_observation_dates_align_with_encounters(self):
+    def test_observation_dates_align_with_encounters(self, persona_bundles):
         """Observation effectiveDateTimes should fall within encounter periods."""
-        gen = Generator.from_persona("linda_hypertension", seed=42)
-        bundle = gen.generate()
+        bundle = persona_bundles["linda_hypertension"]
 
         # Build encounter lookup by fullUrl
         encounters_by_url = {}
         for entry in bundle.entry:
-            if entry.resource.resource_type == "Encounter":
+            if type(entry.resource) is Encounter:
                 encounters_by_url[entry.fullUrl] = entry.resource
 
         for entry in bundle.entry:
             obs = entry.resource
-            if obs.resource_type != "Observation":
+            if type(obs) is not Observation:
                 continue
             if obs.encounter is None:
                 continue
@@ -253,14 +215,9 @@ class TestGeneratorEncounterLinking:
             # Get the encounter start date (just the date part for comparison)
             enc_period = getattr(enc, "actualPeriod", None) or getattr(enc, "period", None)
             if enc_period and enc_period.start and obs.effectiveDateTime:
-                enc_start = enc_period.start
-                obs_date = obs.effectiveDateTime
-
                 # Both should be on the same day (within 24h)
-                if isinstance(enc_start, str):
-                    enc_start = datetime.fromisoformat(enc_start.replace("+00:00", ""))
-                if isinstance(obs_date, str):
-                    obs_date = datetime.fromisoformat(obs_date.replace("+00:00", ""))
+                enc_start = to_datetime(enc_period.start)
+                obs_date = to_datetime(obs.effectiveDateTime)
 
                 diff = abs((obs_date - enc_start).total_seconds())
                 assert diff < 86400, (
@@ -307,7 +264,7 @@ class TestGeneratorEncounterLinking:
         conditions = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "Condition"
+            if type(e.resource) is Condition
         ]
         assert len(conditions) > 0
         # Without encounters defined, conditions should have no encounter ref
@@ -1,6 +1,10 @@
 """Tests for the Generator class."""
 
+import multiprocessing
+import os
+
 import pytest
+from fhir.resources.bundle import BundleEntry
 from kindling import Generator
 from kindling.persona_loader import PersonaLoader
 
@@ -100,4 +104,118 @@ def test_cohort_generation():
     gen = Generator(profile=profile, seed=42)
     bundles = gen.generate(count=5)
 
-    assert bundles is not None
\ No newline at end of file
+    assert bundles is not None
+
+
+def test_generate_return_index():
+    """Test that return_index groups bundled resources by type."""
+    profile = {
+        "version": "0.1",
+        "mode": "cohort",
+        "demographics": {"age": {"min": 30, "max": 50}},
+        "resources": {"rules": []}
+    }
+
+    gen = Generator(profile=profile, seed=42)
+    bundles, index = gen.generate(count=3, bundle_size=2, return_index=True)
+
+    assert isinstance(bundles, list)
+    assert len(index["Patient"]) == 3
+    bundled = [entry.resource for bundle in bundles for entry in bundle.entry]
+    assert index["Patient"] == bundled
+
+
+def test_index_resources_skips_entries_without_resource():
+    """Test that bundle entries with no resource are left out of the index."""
+    gen = Generator(profile={"version": "0.1", "mode": "cohort"}, seed=42)
+    bundle = gen.generate(count=1)
+    bundle.entry.append(BundleEntry(fullUrl="urn:uuid:missing"))
+
+    index = gen._index_resources([bundle])
+
+    assert sum(len(resources) for resources in index.values()) == len(bundle.entry) - 1
+
+
+def test_rule_condition_evaluation():
+    """Test that rule conditions gate rules per patient."""
+    gen = Generator(profile={"version": "0.1", "mode": "cohort"}, seed=42)
+
+    assert gen._evaluate_rule_condition({}, {"age": 20})
+    assert gen._evaluate_rule_condition({"when": {"condition": "true"}}, {"age": 20})
+    assert gen._evaluate_rule_condition({"when": {"condition": "age > 50"}}, {"age": 51})
+    assert not gen._evaluate_rule_condition({"when": {"condition": "age > 50"}}, {"age": 50})
+    assert not gen._evaluate_rule_condition({"when": {"condition": "false"}}, {"age": 50})
+
+
+def test_parallel_cohort_generation_is_reproducible(monkeypatch):
+    """Test that worker count does not change a seeded parallel cohort."""
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        # xdist workers are multi-threaded, so fork()ing them can deadlock
+        monkeypatch.setattr("kindling.generator.Pool", multiprocessing.get_context("spawn").Pool)
+    profile = {
+        "version": "0.1",
+        "mode": "cohort",
+        "demographics": {"age": {"min": 30, "max": 50}},
+        "resources": {
+            "rules": [
+                {
+                    "name": "labs",
+                    "when": {"condition": "true"},
+                    "then": {
+                        "add_observations": [
+                            {
+                                "loinc": "4548-4",
+                                "display": "HbA1c",
+                                "range": {"min": 6, "max": 9},
+                                "unit": "%",
+                            }
+                        ]
+                    }
+                }
+            ]
+        }
+    }
+
+    def entries(workers):
+        bundle = Generator(profile=profile, seed=42).generate(
+            count=4, request_method="PUT", workers=workers
+        )
+        resources = [entry.resource.model_dump(mode="json") for entry in bundle.entry]
+        for resource in resources:
+            # effectiveDateTime is relative to now, so it can differ between runs
+            resource.pop("effectiveDateTime", None)
+        return resources
+
+    two_workers = entries(2)
+
+    assert len(two_workers) == 8
+    assert two_workers == entries(3)
+
+
+def test_resource_filter_keeps_patient():
+    """Test that filtering by type keeps the referenced Patient."""
+    profile = {
+        "version": "0.1",
+        "mode": "cohort",
+        "resources": {
+            "rules": [
+                {
+                    "name": "dx",
+                    "when": {"condition": "true"},
+                    "then": {
+                        "add_conditions": [{"code": {"value": "44054006", "display": "Diabetes"}}],
+                        "add_observations": [
+                            {"loinc": "4548-4", "display": "HbA1c", "value": 7.0, "unit": "%"}
+                        ]
+                    }
+                }
+            ]
+        }
+    }
+
+    gen = Generator(profile=profile, seed=42)
+    gen.set_resource_filter(["Observation"])
+    bundle = gen.generate(count=1)
+
+    types = [entry.resource.resource_type for entry in bundle.entry]
+    assert types == ["Patient", "Observation"]
@@ -4,18 +4,12 @@ import pytest
 from fhir.resources.medicationstatement import MedicationStatement
 
 from kindling import Generator
-from kindling.resource_factory import ResourceFactory
-from kindling.utils.random_utils import SeededRandom
 
 
 class TestMedicationStatementFactory:
     """Test MedicationStatement creation in ResourceFactory."""
 
-    def setup_method(self):
-        self.rng = SeededRandom(42)
-        self.factory = ResourceFactory(self.rng)
-
-    def test_create_medication_statement(self):
+    def test_create_medication_statement(self, factory):
         """Should create a valid MedicationStatement resource."""
         med_def = {
             "rxnorm": "314077",
@@ -24,7 +18,7 @@ class TestMedicationStatementFactory:
             "status": "recorded",
         }
 
-        med_stmt = self.factory.create_medication_statement(
+        med_stmt = factory.create_medication_statement(
             patient_id="patient-1",
             medication_def=med_def,
             medication_id="medstmt-1",
@@ -37,7 +31,7 @@ class TestMedicationStatementFactory:
         assert med_stmt.medication.concept.coding[0].display == "lisinopril 20 MG Oral Tablet"
         assert med_stmt.subject.reference == "Patient/patient-1"
 
-    def test_create_medication_statement_with_encounter(self):
+    def test_create_medication_statement_with_encounter(self, factory):
         """Should include encounter reference when provided."""
         med_def = {
             "rxnorm": "314077",
@@ -45,7 +39,7 @@ class TestMedicationStatementFactory:
             "sig": "Take 1 tablet by mouth daily",
         }
 
-        med_stmt = self.factory.create_medication_statement(
+        med_stmt = factory.create_medication_statement(
             patient_id="patient-1",
             medication_def=med_def,
             encounter_ref="Encounter/enc-1",
@@ -53,14 +47,14 @@ class TestMedicationStatementFactory:
 
         assert med_stmt.encounter.reference == "Encounter/enc-1"
 
-    def test_create_medication_statement_default_status(self):
+    def test_create_medication_statement_default_status(self, factory):
         """Default status should be 'recorded'."""
         med_def = {
             "rxnorm": "314077",
             "display": "lisinopril 20 MG Oral Tablet",
         }
 
-        med_stmt = self.factory.create_medication_statement(
+        med_stmt = factory.create_medication_statement(
             patient_id="patient-1",
             medication_def=med_def,
         )
@@ -112,7 +106,7 @@ class TestMedicationStatementGenerator:
         med_stmts = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "MedicationStatement"
+            if type(e.resource) is MedicationStatement
         ]
 
         assert len(med_stmts) == 2
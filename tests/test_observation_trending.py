@@ -1,23 +1,17 @@
 """Tests for observation times expansion and trending values."""
 
-from datetime import datetime, timedelta
-
 import pytest
 from fhir.resources.observation import Observation
 
 from kindling import Generator
-from kindling.resource_factory import ResourceFactory
-from kindling.utils.random_utils import SeededRandom
+
+from .conftest import to_datetime
 
 
 class TestComponentFixedValue:
     """Test that observation components support fixed 'value' (not just range)."""
 
-    def setup_method(self):
-        self.rng = SeededRandom(42)
-        self.factory = ResourceFactory(self.rng)
-
-    def test_component_with_fixed_value(self):
+    def test_component_with_fixed_value(self, factory):
         """Components should accept a fixed 'value' instead of 'range'."""
         obs_def = {
             "loinc": "85354-9",
@@ -38,7 +32,7 @@ class TestComponentFixedValue:
             ],
         }
 
-        obs = self.factory.create_observation(
+        obs = factory.create_observation(
             patient_id="p-1",
             observation_def=obs_def,
             observation_id="obs-1",
@@ -101,7 +95,7 @@ class TestTimesExpansion:
         observations = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "Observation"
+            if type(e.resource) is Observation
         ]
 
         assert len(observations) == 4, (
@@ -158,7 +152,7 @@ class TestTimesExpansion:
         observations = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "Observation"
+            if type(e.resource) is Observation
         ]
 
         for obs in observations:
@@ -166,6 +160,50 @@ class TestTimesExpansion:
                 f"Observation {obs.id} should have encounter ref"
             )
 
+    def test_times_without_encounters_share_one_date(self):
+        """Without encounters, expanded observations share one sampled date."""
+        profile = {
+            "version": "0.1",
+            "mode": "single",
+            "single_patient": {
+                "name": {"family": "Test", "given": ["Lookback"]},
+                "gender": "female",
+                "birthDate": "1970-01-01",
+            },
+            "resources": {
+                "rules": [
+                    {
+                        "name": "labs",
+                        "when": {"condition": "true"},
+                        "then": {
+                            "add_observations": [
+                                {
+                                    "loinc": "2339-0",
+                                    "display": "Glucose",
+                                    "range": {"min": 120, "max": 180},
+                                    "unit": "mg/dL",
+                                    "times": {"qty": 3, "lookback_months": 3},
+                                }
+                            ],
+                        },
+                    }
+                ],
+            },
+        }
+
+        gen = Generator(profile=profile, seed=42)
+        bundle = gen.generate()
+
+        observations = [
+            e.resource
+            for e in bundle.entry
+            if type(e.resource) is Observation
+        ]
+
+        assert len(observations) == 3
+
+        assert len({obs.effectiveDateTime for obs in observations}) == 1
+
 
 class TestTrendingValues:
     """Test that trending observations interpolate values over time."""
@@ -220,18 +258,16 @@ class TestTrendingValues:
         observations = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "Observation"
+            if type(e.resource) is Observation
         ]
 
         assert len(observations) == 4
 
         # Extract values sorted by date (oldest first)
-        dated_values = []
-        for obs in observations:
-            dt = obs.effectiveDateTime
-            if isinstance(dt, str):
-                dt = datetime.fromisoformat(dt.replace("+00:00", ""))
-            dated_values.append((dt, obs.valueQuantity.value))
+        dated_values = [
+            (to_datetime(obs.effectiveDateTime), obs.valueQuantity.value)
+            for obs in observations
+        ]
 
         dated_values.sort(key=lambda x: x[0])
         values = [v for _, v in dated_values]
@@ -317,19 +353,16 @@ class TestTrendingValues:
         observations = [
             e.resource
             for e in bundle.entry
-            if e.resource.resource_type == "Observation"
+            if type(e.resource) is Observation
         ]
 
         assert len(observations) == 4
 
         # Extract systolic values sorted by date (oldest first)
-        dated_systolics = []
-        for obs in observations:
-            dt = obs.effectiveDateTime
-            if isinstance(dt, str):
-                dt = datetime.fromisoformat(dt.replace("+00:00", ""))
-            systolic = obs.component[0].valueQuantity.value
-            dated_systolics.append((dt, systolic))
+        dated_systolics = [
+            (to_datetime(obs.effectiveDateTime), obs.component[0].valueQuantity.value)
+            for obs in observations
+        ]
 
         dated_systolics.sort(key=lambda x: x[0])
         systolics = [v for _, v in dated_systolics]
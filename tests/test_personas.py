@@ -1,13 +1,12 @@
 """Tests for personas."""
 
 import pytest
-from kindling.persona_loader import PersonaLoader
+from kindling.persona_loader import default_loader
 
 
 def test_list_personas():
     """Test listing available personas."""
-    loader = PersonaLoader()
-    personas = loader.list_personas()
+    personas = default_loader.list_personas()
 
     assert "mary_diabetes" in personas
     assert "john_asthma" in personas
@@ -17,8 +16,7 @@ def test_list_personas():
 
 def test_load_mary_persona():
     """Test loading Mary diabetes persona."""
-    loader = PersonaLoader()
-    data = loader.load("mary_diabetes")
+    data = default_loader.load("mary_diabetes")
 
     assert data is not None
     assert data["name"] == "mary_diabetes"
@@ -28,19 +26,51 @@ def test_load_mary_persona():
 
 def test_load_nonexistent_persona():
     """Test loading non-existent persona raises error."""
-    loader = PersonaLoader()
     with pytest.raises(ValueError, match="Persona 'nonexistent' not found"):
-        loader.load("nonexistent")
+        default_loader.load("nonexistent")
 
 
 def test_persona_caching():
     """Test that personas are cached after first load."""
-    loader = PersonaLoader()
-
     # Load once
-    data1 = loader.load("mary_diabetes")
+    data1 = default_loader.load("mary_diabetes")
+
+    # Load again (should come from cache, as an independent copy)
+    data2 = default_loader.load("mary_diabetes")
+
+    assert data1 == data2
+    assert data1 is not data2
+    assert data1["resources"] is not data2["resources"]
+    assert "mary_diabetes" in default_loader._personas_cache
+
+
+def test_cached_persona_is_read_only():
+    """Test that a loaded persona cannot be modified at the top level."""
+    data = default_loader.load("mary_diabetes")
+
+    with pytest.raises(TypeError):
+        data["name"] = "someone_else"
+
+    assert default_loader.load("mary_diabetes")["name"] == "mary_diabetes"
+
+
+def test_nested_persona_edits_do_not_leak_into_cache():
+    """Test that editing nested persona data leaves the cached persona intact."""
+    data = default_loader.load("mary_diabetes")
+
+    data["patient"]["gender"] = "male"
+    data["resources"]["rules"].append({})
+
+    reloaded = default_loader.load("mary_diabetes")
+    assert reloaded["patient"]["gender"] == "female"
+    assert len(reloaded["resources"]["rules"]) == len(data["resources"]["rules"]) - 1
+
+
+def test_generators_share_persona_cache():
+    """Test that generators reuse personas loaded by the default loader."""
+    from kindling import Generator
 
-    # Load again (should come from cache)
-    data2 = loader.load("mary_diabetes")
+    data = default_loader.load("mary_diabetes")
+    generator = Generator.from_persona("mary_diabetes")
 
-    assert data1 is data2  # Same object reference
\ No newline at end of file
+    assert generator.persona_data == data
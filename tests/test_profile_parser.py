@@ -1,8 +1,7 @@
 """Tests for profile parser module."""
 
 import json
-import tempfile
-from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 import yaml
@@ -11,115 +10,105 @@ from pydantic import ValidationError
 from kindling.profile_parser import ProfileParser
 from kindling.schemas import ProfileSchema
 
+# Shared read-only profile; tests copy it before changing anything
+VALID_PROFILE = MappingProxyType({
+    "version": "0.1",
+    "mode": "cohort",
+    "demographics": {
+        "age": {"min": 18, "max": 90},
+        "gender": {
+            "distribution": {"male": 0.5, "female": 0.5}
+        }
+    },
+    "resources": {
+        "include": ["Patient", "Condition", "Observation"],
+        "rules": [
+            {
+                "name": "diabetes",
+                "when": {"condition": "age > 50"},
+                "then": {
+                    "add_conditions": [
+                        {
+                            "code": {
+                                "system": "http://snomed.info/sct",
+                                "value": "44054006",
+                                "display": "Type 2 diabetes mellitus"
+                            },
+                            "onset": {"years_ago": 5}
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+})
+
 
 class TestProfileParser:
     """Test suite for ProfileParser."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.parser = ProfileParser()
-        self.valid_profile = {
-            "version": "0.1",
-            "mode": "cohort",
-            "demographics": {
-                "age": {"min": 18, "max": 90},
-                "gender": {
-                    "distribution": {"male": 0.5, "female": 0.5}
-                }
-            },
-            "resources": {
-                "include": ["Patient", "Condition", "Observation"],
-                "rules": [
-                    {
-                        "name": "diabetes",
-                        "when": {"condition": "age > 50"},
-                        "then": {
-                            "add_conditions": [
-                                {
-                                    "code": {
-                                        "system": "http://snomed.info/sct",
-                                        "value": "44054006",
-                                        "display": "Type 2 diabetes mellitus"
-                                    },
-                                    "onset": {"years_ago": 5}
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-        }
+    # Shared by every test in the class instead of rebuilt in setup_method
+    parser = ProfileParser()
+    valid_profile = VALID_PROFILE
 
     def test_parse_yaml_profile(self):
-        """Test parsing a YAML profile file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(self.valid_profile, f)
-            temp_path = f.name
-
-        try:
-            result = self.parser.parse(temp_path)
-            assert result["version"] == "0.1"
-            assert result["mode"] == "cohort"
-            assert "demographics" in result
-            assert "resources" in result
-        finally:
-            Path(temp_path).unlink()
+        """Test parsing a YAML profile."""
+        result = self.parser.parse_string(yaml.safe_dump(dict(self.valid_profile)), "yaml")
+        assert result["version"] == "0.1"
+        assert result["mode"] == "cohort"
+        assert "demographics" in result
+        assert "resources" in result
 
     def test_parse_json_profile(self):
-        """Test parsing a JSON profile file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(self.valid_profile, f)
-            temp_path = f.name
-
-        try:
-            result = self.parser.parse(temp_path)
-            assert result["version"] == "0.1"
-            assert result["mode"] == "cohort"
-            assert "demographics" in result
-            assert "resources" in result
-        finally:
-            Path(temp_path).unlink()
+        """Test parsing a JSON profile."""
+        result = self.parser.parse_string(json.dumps(dict(self.valid_profile)), "json")
+        assert result["version"] == "0.1"
+        assert result["mode"] == "cohort"
+        assert "demographics" in result
+        assert "resources" in result
+
+    def test_parse_profile_files(self, tmp_path):
+        """Test parsing YAML and JSON profile files from disk."""
+        yaml_path = tmp_path / "profile.yaml"
+        yaml_path.write_text(yaml.safe_dump(dict(self.valid_profile)))
+        json_path = tmp_path / "profile.json"
+        json_path.write_text(json.dumps(dict(self.valid_profile)))
+
+        assert self.parser.parse(yaml_path) == self.parser.parse(json_path)
+        assert self.parser.parse(str(yaml_path))["mode"] == "cohort"
 
     def test_parse_nonexistent_file(self):
         """Test parsing a non-existent file raises ValueError."""
         with pytest.raises(ValueError, match="Profile file not found"):
             self.parser.parse("/nonexistent/file.yaml")
 
-    def test_parse_unsupported_format(self):
+    def test_parse_unsupported_format(self, tmp_path):
         """Test parsing unsupported file format raises ValueError."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("some content")
-            temp_path = f.name
+        temp_path = tmp_path / "profile.txt"
+        temp_path.write_text("some content")
+
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            self.parser.parse(temp_path)
 
-        try:
-            with pytest.raises(ValueError, match="Unsupported file format"):
-                self.parser.parse(temp_path)
-        finally:
-            Path(temp_path).unlink()
+    def test_parse_string_unsupported_format(self):
+        """Test parsing content in an unknown format raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported format"):
+            self.parser.parse_string("version: '0.1'", "toml")
 
     def test_parse_invalid_yaml(self):
         """Test parsing invalid YAML raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            temp_path = f.name
-
-        try:
-            with pytest.raises(Exception):  # yaml.YAMLError or similar
-                self.parser.parse(temp_path)
-        finally:
-            Path(temp_path).unlink()
+        with pytest.raises(Exception):  # yaml.YAMLError or similar
+            self.parser.parse_string("invalid: yaml: content: [", "yaml")
 
     def test_parse_invalid_json(self):
         """Test parsing invalid JSON raises error."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('{"invalid": json content}')
-            temp_path = f.name
+        with pytest.raises(Exception):  # json.JSONDecodeError
+            self.parser.parse_string('{"invalid": json content}', "json")
 
-        try:
-            with pytest.raises(Exception):  # json.JSONDecodeError
-                self.parser.parse(temp_path)
-        finally:
-            Path(temp_path).unlink()
+    def test_parse_empty_profile(self):
+        """Test that an empty document is reported as an invalid profile."""
+        with pytest.raises(ValueError, match="Invalid profile"):
+            self.parser.parse_string("", "yaml")
 
     def test_validate_valid_profile(self):
         """Test validating a valid profile."""
@@ -145,33 +134,19 @@ class TestProfileParser:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(single_profile, f)
-            temp_path = f.name
-
-        try:
-            result = self.parser.parse(temp_path)
-            assert result["mode"] == "single"
-            assert "single_patient" in result
-        finally:
-            Path(temp_path).unlink()
+        result = self.parser.parse_string(yaml.safe_dump(single_profile), "yaml")
+        assert result["mode"] == "single"
+        assert "single_patient" in result
 
     def test_default_values(self):
         """Test that default values are applied."""
         minimal_profile = {"version": "0.1"}
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(minimal_profile, f)
-            temp_path = f.name
-
-        try:
-            result = self.parser.parse(temp_path)
-            assert result["mode"] == "cohort"  # Default mode
-            assert result["demographics"] == {}
-            assert result["resources"] == {}
-            assert result["output"] == {}
-        finally:
-            Path(temp_path).unlink()
+        result = self.parser.parse_string(yaml.safe_dump(minimal_profile), "yaml")
+        assert result["mode"] == "cohort"  # Default mode
+        assert result["demographics"] == {}
+        assert result["resources"] == {}
+        assert result["output"] == {}
 
 
 class TestProfileSchema:
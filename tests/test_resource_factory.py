@@ -1,6 +1,6 @@
 """Tests for resource factory module."""
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import pytest
 from fhir.resources.patient import Patient
@@ -12,52 +12,139 @@ from fhir.resources.encounter import Encounter
 from kindling.resource_factory import ResourceFactory
 from kindling.utils.random_utils import SeededRandom
 
+from .conftest import to_datetime
+
+
+# Factory input defs, shared read-only across tests
+FULL_PATIENT_DEF = {
+    "name": {
+        "given": ["John", "Michael"],
+        "family": "Smith"
+    },
+    "gender": "male",
+    "birthDate": "1980-05-15",
+    "identifiers": [
+        {
+            "system": "http://hospital.example/mrn",
+            "value": "MRN-12345"
+        }
+    ],
+    "address": {
+        "line": ["123 Main St"],
+        "city": "Boston",
+        "state": "MA",
+        "postalCode": "02134",
+        "country": "US"
+    },
+    "telecom": [
+        {
+            "system": "phone",
+            "value": "555-1234",
+            "use": "home"
+        },
+        {
+            "system": "email",
+            "value": "john@example.com",
+            "use": "home"
+        }
+    ]
+}
+
+
+FEMALE_PATIENT_DEF = {"gender": "female"}
+
+
+MALE_PATIENT_DEF = {"gender": "male"}
+
+
+DIABETES_CONDITION_DEF = {
+    "code": {
+        "system": "http://snomed.info/sct",
+        "value": "44054006",
+        "display": "Type 2 diabetes mellitus"
+    },
+    "onset": {
+        "years_ago": 5
+    }
+}
+
+
+HYPERTENSION_CONDITION_DEF = {
+    "code": {
+        "system": "http://snomed.info/sct",
+        "value": "38341003",
+        "display": "Hypertension"
+    }
+}
+
+
+HBA1C_RANGE_OBS_DEF = {
+    "loinc": "4548-4",
+    "display": "Hemoglobin A1c",
+    "range": {
+        "min": 6.5,
+        "max": 9.0
+    },
+    "unit": "%"
+}
+
+
+GLUCOSE_OBS_DEF = {
+    "loinc": "2339-0",
+    "display": "Glucose",
+    "value": 120,
+    "unit": "mg/dL"
+}
+
+
+METFORMIN_MED_DEF = {
+    "rxnorm": "860975",
+    "display": "metformin 1000 MG Oral Tablet",
+    "sig": "Take 1 tablet by mouth twice daily",
+    "frequency": 2
+}
+
+
+PRN_MED_DEF = {
+    "rxnorm": "123456",
+    "display": "Pain medication",
+    "sig": "Take as needed for pain",
+    "frequency": 0.5  # PRN
+}
+
+
+AMBULATORY_ENCOUNTER_DEF = {
+    "type": {
+        "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
+        "code": "AMB",
+        "display": "ambulatory"
+    },
+    "class": {
+        "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
+        "code": "AMB"
+    },
+    "duration_hours": 2
+}
+
+
+INPATIENT_ENCOUNTER_DEF = {
+    "type": {
+        "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
+        "code": "IMP",
+        "display": "inpatient"
+    }
+}
+
+
+HBA1C_OBS_DEF = {"loinc": "4548-4", "display": "Hemoglobin A1c", "value": 7.0, "unit": "%"}
+
 
 class TestResourceFactory:
     """Test suite for ResourceFactory."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.rng = SeededRandom(42)
-        self.factory = ResourceFactory(self.rng)
-
-    def test_create_patient_with_full_data(self):
+    def test_create_patient_with_full_data(self, factory):
         """Test creating a patient with complete data."""
-        patient_def = {
-            "name": {
-                "given": ["John", "Michael"],
-                "family": "Smith"
-            },
-            "gender": "male",
-            "birthDate": "1980-05-15",
-            "identifiers": [
-                {
-                    "system": "http://hospital.example/mrn",
-                    "value": "MRN-12345"
-                }
-            ],
-            "address": {
-                "line": ["123 Main St"],
-                "city": "Boston",
-                "state": "MA",
-                "postalCode": "02134",
-                "country": "US"
-            },
-            "telecom": [
-                {
-                    "system": "phone",
-                    "value": "555-1234",
-                    "use": "home"
-                },
-                {
-                    "system": "email",
-                    "value": "john@example.com",
-                    "use": "home"
-                }
-            ]
-        }
-
-        patient = self.factory.create_patient(patient_def, "patient-123")
+        patient = factory.create_patient(FULL_PATIENT_DEF, "patient-123")
 
         assert isinstance(patient, Patient)
         assert patient.id == "patient-123"
@@ -70,47 +157,29 @@ class TestResourceFactory:
         assert patient.address[0].city == "Boston"
         assert len(patient.telecom) == 2
 
-    def test_create_patient_with_minimal_data(self):
-        """Test creating a patient with minimal data."""
-        patient_def = {
-            "gender": "female"
-        }
-
-        patient = self.factory.create_patient(patient_def)
+    @pytest.mark.parametrize("patient_def", [
+        pytest.param(FEMALE_PATIENT_DEF, id="female"),
+        pytest.param(MALE_PATIENT_DEF, id="male"),
+    ])
+    def test_create_patient_with_minimal_data(self, factory, patient_def):
+        """Test creating a patient with minimal data and no explicit ID."""
+        patient = factory.create_patient(patient_def)
 
         assert isinstance(patient, Patient)
-        assert patient.id is not None
-        assert patient.gender == "female"
+        # ID is generated if not provided
+        assert patient.id
+        assert patient.gender == patient_def["gender"]
         # Should have default name
         assert patient.name[0].family == "Doe"
         # Should have default MRN
         assert len(patient.identifier) == 1
         assert "MRN-" in patient.identifier[0].value
 
-    def test_create_patient_without_id(self):
-        """Test that patient ID is generated if not provided."""
-        patient_def = {"gender": "male"}
-        patient = self.factory.create_patient(patient_def)
-
-        assert patient.id is not None
-        assert len(patient.id) > 0
-
-    def test_create_condition(self):
+    def test_create_condition(self, factory, frozen_now):
         """Test creating a condition resource."""
-        condition_def = {
-            "code": {
-                "system": "http://snomed.info/sct",
-                "value": "44054006",
-                "display": "Type 2 diabetes mellitus"
-            },
-            "onset": {
-                "years_ago": 5
-            }
-        }
-
-        condition = self.factory.create_condition(
+        condition = factory.create_condition(
             patient_id="patient-123",
-            condition_def=condition_def,
+            condition_def=DIABETES_CONDITION_DEF,
             condition_id="condition-456"
         )
 
@@ -121,43 +190,27 @@ class TestResourceFactory:
         assert condition.clinicalStatus.coding[0].code == "active"
         assert condition.verificationStatus.coding[0].code == "confirmed"
 
-        # Check onset date is approximately 5 years ago
-        onset_date = datetime.strptime(condition.onsetDateTime, "%Y-%m-%d")
-        expected_date = datetime.now() - timedelta(days=5 * 365)
-        date_diff = abs((onset_date - expected_date).days)
-        assert date_diff < 2  # Allow 1-2 days difference
+        # Onset is exactly 5 years (of 365 days) before the frozen clock
+        onset_date = to_datetime(condition.onsetDateTime).date()
+        assert onset_date == (frozen_now - timedelta(days=5 * 365)).date()
 
-    def test_create_condition_with_patient_ref(self):
+    def test_create_condition_with_patient_ref(self, factory):
         """Test creating condition with custom patient reference."""
-        condition_def = {
-            "code": {
-                "system": "http://snomed.info/sct",
-                "value": "38341003",
-                "display": "Hypertension"
-            }
-        }
-
-        condition = self.factory.create_condition(
+        condition = factory.create_condition(
             patient_id="patient-123",
-            condition_def=condition_def,
+            condition_def=HYPERTENSION_CONDITION_DEF,
             patient_ref="urn:uuid:abc-def-ghi"
         )
 
         assert condition.subject.reference == "urn:uuid:abc-def-ghi"
 
-    def test_create_observation(self):
-        """Test creating an observation resource."""
-        obs_def = {
-            "loinc": "4548-4",
-            "display": "Hemoglobin A1c",
-            "range": {
-                "min": 6.5,
-                "max": 9.0
-            },
-            "unit": "%"
-        }
-
-        observation = self.factory.create_observation(
+    @pytest.mark.parametrize("obs_def, low, high", [
+        pytest.param(HBA1C_RANGE_OBS_DEF, 6.5, 9.0, id="ranged"),
+        pytest.param(GLUCOSE_OBS_DEF, 120, 120, id="fixed"),
+    ])
+    def test_create_observation(self, factory, obs_def, low, high):
+        """Test creating an observation resource with ranged and fixed values."""
+        observation = factory.create_observation(
             patient_id="patient-123",
             observation_def=obs_def,
             observation_id="obs-789"
@@ -166,41 +219,22 @@ class TestResourceFactory:
         assert isinstance(observation, Observation)
         assert observation.id == "obs-789"
         assert observation.status == "final"
-        assert observation.code.coding[0].code == "4548-4"
+        assert observation.code.coding[0].code == obs_def["loinc"]
         assert observation.subject.reference == "Patient/patient-123"
 
-        # Check value is within specified range
+        # Check value is within the specified range (or equals the fixed value)
         value = observation.valueQuantity.value
-        assert 6.5 <= value <= 9.0
-        assert observation.valueQuantity.unit == "%"
-
-    def test_create_observation_with_fixed_value(self):
-        """Test creating observation with fixed value."""
-        obs_def = {
-            "loinc": "2339-0",
-            "display": "Glucose",
-            "value": 120,
-            "unit": "mg/dL"
-        }
+        assert low <= value <= high
+        assert observation.valueQuantity.unit == obs_def["unit"]
 
-        observation = self.factory.create_observation(
-            patient_id="patient-123",
-            observation_def=obs_def
-        )
-
-        assert observation.valueQuantity.value == 120
-        assert observation.valueQuantity.unit == "mg/dL"
-
-    def test_create_medication_request(self):
-        """Test creating a medication request."""
-        med_def = {
-            "rxnorm": "860975",
-            "display": "metformin 1000 MG Oral Tablet",
-            "sig": "Take 1 tablet by mouth twice daily",
-            "frequency": 2
-        }
-
-        med_request = self.factory.create_medication_request(
+    @pytest.mark.parametrize("med_def, expected_frequency", [
+        pytest.param(METFORMIN_MED_DEF, 2, id="scheduled"),
+        # Frequency should be normalized to 1 for PRN
+        pytest.param(PRN_MED_DEF, 1, id="prn"),
+    ])
+    def test_create_medication_request(self, factory, med_def, expected_frequency):
+        """Test creating scheduled and PRN (frequency < 1) medication requests."""
+        med_request = factory.create_medication_request(
             patient_id="patient-123",
             medication_def=med_def,
             medication_id="med-456"
@@ -211,43 +245,18 @@ class TestResourceFactory:
         assert med_request.status == "active"
         assert med_request.intent == "order"
         assert med_request.subject.reference == "Patient/patient-123"
-        assert med_request.medication.concept.coding[0].code == "860975"
-        assert med_request.dosageInstruction[0].text == "Take 1 tablet by mouth twice daily"
-        assert med_request.dosageInstruction[0].timing["repeat"]["frequency"] == 2
-
-    def test_create_medication_request_with_prn(self):
-        """Test creating PRN medication (frequency < 1)."""
-        med_def = {
-            "rxnorm": "123456",
-            "display": "Pain medication",
-            "sig": "Take as needed for pain",
-            "frequency": 0.5  # PRN
-        }
+        assert med_request.medication.concept.coding[0].code == med_def["rxnorm"]
+        assert med_request.dosageInstruction[0].text == med_def["sig"]
+        assert med_request.dosageInstruction[0].timing["repeat"]["frequency"] == expected_frequency
 
-        med_request = self.factory.create_medication_request(
-            patient_id="patient-123",
-            medication_def=med_def
-        )
-
-        # Frequency should be normalized to 1 for PRN
-        assert med_request.dosageInstruction[0].timing["repeat"]["frequency"] == 1
-
-    def test_create_encounter(self):
-        """Test creating an encounter resource."""
-        encounter_def = {
-            "type": {
-                "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
-                "code": "AMB",
-                "display": "ambulatory"
-            },
-            "class": {
-                "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
-                "code": "AMB"
-            },
-            "duration_hours": 2
-        }
-
-        encounter = self.factory.create_encounter(
+    @pytest.mark.parametrize("encounter_def, expected_hours", [
+        pytest.param(AMBULATORY_ENCOUNTER_DEF, 2, id="explicit-duration"),
+        # Should have default 1 hour duration
+        pytest.param(INPATIENT_ENCOUNTER_DEF, 1, id="default-duration"),
+    ])
+    def test_create_encounter(self, factory, frozen_now, encounter_def, expected_hours):
+        """Test creating an encounter resource with explicit and default duration."""
+        encounter = factory.create_encounter(
             patient_id="patient-123",
             encounter_def=encounter_def,
             encounter_id="enc-789"
@@ -256,49 +265,45 @@ class TestResourceFactory:
         assert isinstance(encounter, Encounter)
         assert encounter.id == "enc-789"
         assert encounter.status == "finished"
-        assert encounter.class_fhir.code == "AMB"
-        assert encounter.type[0].coding[0].code == "AMB"
+        assert encounter.type[0].coding[0].code == encounter_def["type"]["code"]
         assert encounter.subject.reference == "Patient/patient-123"
         assert encounter.period is not None
         assert encounter.period.start is not None
         assert encounter.period.end is not None
 
-        # Check duration is approximately 2 hours
-        start = datetime.fromisoformat(encounter.period.start.replace('+00:00', ''))
-        end = datetime.fromisoformat(encounter.period.end.replace('+00:00', ''))
-        duration_hours = (end - start).total_seconds() / 3600
-        assert 1.9 <= duration_hours <= 2.1
-
-    def test_create_encounter_default_duration(self):
-        """Test encounter with default duration."""
-        encounter_def = {
-            "type": {
-                "system": "http://terminology.hl7.org/CodeSystem/v3-ActCode",
-                "code": "IMP",
-                "display": "inpatient"
-            }
-        }
+        start = to_datetime(encounter.period.start)
+        assert start.replace(tzinfo=None) <= frozen_now
+        assert to_datetime(encounter.period.end) - start == timedelta(hours=expected_hours)
 
-        encounter = self.factory.create_encounter(
+    def test_encounter_class_from_def(self, factory):
+        """Test that an explicit encounter class is carried onto the resource."""
+        encounter = factory.create_encounter(
             patient_id="patient-123",
-            encounter_def=encounter_def
+            encounter_def=AMBULATORY_ENCOUNTER_DEF
         )
 
-        # Should have default 1 hour duration
-        start = datetime.fromisoformat(encounter.period.start.replace('+00:00', ''))
-        end = datetime.fromisoformat(encounter.period.end.replace('+00:00', ''))
-        duration_hours = (end - start).total_seconds() / 3600
-        assert 0.9 <= duration_hours <= 1.1
+        assert encounter.class_fhir.code == "AMB"
+
+    def test_subject_reference_not_aliased_per_patient(self, factory):
+        """Test that resources for one patient get independent subject References."""
+        first = factory.create_observation(patient_id="patient-123", observation_def=HBA1C_OBS_DEF)
+        second = factory.create_observation(patient_id="patient-123", observation_def=HBA1C_OBS_DEF)
+        other = factory.create_observation(patient_id="patient-456", observation_def=HBA1C_OBS_DEF)
+        first.subject.display = "changed"
+
+        assert first.subject is not second.subject
+        assert second.subject.display is None
+        assert second.subject.reference == "Patient/patient-123"
+        assert other.subject.reference == "Patient/patient-456"
+        assert first.subject.reference == "Patient/patient-123"
 
     def test_deterministic_generation(self):
         """Test that using same seed produces same results."""
         factory1 = ResourceFactory(SeededRandom(100))
         factory2 = ResourceFactory(SeededRandom(100))
 
-        patient_def = {"gender": "male"}
-
-        patient1 = factory1.create_patient(patient_def)
-        patient2 = factory2.create_patient(patient_def)
+        patient1 = factory1.create_patient(MALE_PATIENT_DEF)
+        patient2 = factory2.create_patient(MALE_PATIENT_DEF)
 
         assert patient1.id == patient2.id
         assert patient1.identifier[0].value == patient2.identifier[0].value
@@ -308,9 +313,7 @@ class TestResourceFactory:
         factory1 = ResourceFactory(SeededRandom(100))
         factory2 = ResourceFactory(SeededRandom(200))
 
-        patient_def = {"gender": "male"}
-
-        patient1 = factory1.create_patient(patient_def)
-        patient2 = factory2.create_patient(patient_def)
+        patient1 = factory1.create_patient(MALE_PATIENT_DEF)
+        patient2 = factory2.create_patient(MALE_PATIENT_DEF)
 
         assert patient1.id != patient2.id
\ No newline at end of file
@@ -1,6 +1,5 @@
 """Tests for FHIR bundle validation."""
 
-import json
 import pytest
 from fhir.resources.bundle import Bundle
 from fhir.resources.patient import Patient
@@ -9,37 +8,75 @@ from fhir.resources.observation import Observation
 from fhir.resources.medicationrequest import MedicationRequest
 
 from kindling import Generator
-from kindling.bundle_assembler import BundleAssembler
+from kindling.utils import json_utils
+
+
+# Allowed FHIR code values checked by the validators below
+BUNDLE_TYPES = frozenset({
+    "transaction", "collection", "document", "message", "history", "searchset", "batch",
+})
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "DELETE", "PATCH"})
+GENDERS = frozenset({"male", "female", "other", "unknown"})
+OBSERVATION_STATUSES = frozenset({
+    "registered", "preliminary", "final", "amended", "corrected", "cancelled",
+    "entered-in-error", "unknown",
+})
+MEDICATION_REQUEST_STATUSES = frozenset({
+    "active", "on-hold", "cancelled", "completed", "entered-in-error", "stopped", "draft",
+    "unknown",
+})
+MEDICATION_REQUEST_INTENTS = frozenset({
+    "proposal", "plan", "order", "original-order", "reflex-order", "filler-order",
+    "instance-order", "option",
+})
+
+# Codes that mark mary_diabetes' diabetes condition, medication and labs
+DIABETES_CODES = frozenset({"44054006"})  # Type 2 diabetes SNOMED code
+DIABETES_MEDS = frozenset({"860975"})  # metformin RxNorm code
+HBA1C_CODES = frozenset({"4548-4"})  # HbA1c LOINC code
+
+
+def _patient_entry(bundle):
+    """Return the first Patient entry of a bundle, or None."""
+    # Leaf type: generator output never subclasses fhir.resources classes
+    return next((e for e in bundle.entry if type(e.resource) is Patient), None)
+
+
+# POST transaction personas that the persona-agnostic checks run against
+VALIDATED_PERSONAS = ["mary_diabetes", "john_asthma"]
+
+
+@pytest.fixture(scope="module")
+def persona_json(persona_bundles):
+    """Indented JSON for each VALIDATED_PERSONAS bundle, serialized once."""
+    return {name: persona_bundles[name].json(indent=2) for name in VALIDATED_PERSONAS}
 
 
 class TestBundleValidation:
     """Test suite for validating generated FHIR bundles."""
 
-    def test_bundle_is_valid_json(self):
+    @pytest.mark.parametrize("persona", VALIDATED_PERSONAS)
+    def test_bundle_is_valid_json(self, persona_json, persona):
         """Test that generated bundles are valid JSON."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
-
         # Should be able to serialize to JSON without errors
-        json_str = bundle.json(indent=2)
+        json_str = persona_json[persona]
         assert json_str is not None
 
         # Should be able to parse back from JSON
-        parsed = json.loads(json_str)
+        parsed = json_utils.loads(json_str)
         assert parsed["resourceType"] == "Bundle"
         assert parsed["type"] == "transaction"
         assert "entry" in parsed
         assert isinstance(parsed["entry"], list)
 
-    def test_bundle_structure_validation(self):
+    @pytest.mark.parametrize("persona", VALIDATED_PERSONAS)
+    def test_bundle_structure_validation(self, persona_bundles, persona):
         """Test that bundle structure conforms to FHIR spec."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
+        bundle = persona_bundles[persona]
 
         # Validate bundle has required fields
-        bundle_dict = bundle.dict()
-        assert bundle_dict['resourceType'] == "Bundle"
-        assert bundle.type in ["transaction", "collection", "document", "message", "history", "searchset", "batch"]
+        assert bundle.resource_type == "Bundle"
+        assert bundle.type in BUNDLE_TYPES
         assert bundle.id is not None
         assert bundle.timestamp is not None
 
@@ -55,13 +92,20 @@ class TestBundleValidation:
             # Transaction bundles should have request
             if bundle.type == "transaction":
                 assert entry.request is not None
-                assert entry.request.method in ["GET", "POST", "PUT", "DELETE", "PATCH"]
+                assert entry.request.method in HTTP_METHODS
                 assert entry.request.url is not None
 
-    def test_resource_validation(self):
+    def test_resource_validation(self, persona_bundles):
         """Test that individual resources in bundle are valid."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
+        bundle = persona_bundles["mary_diabetes"]
+
+        # Resource-specific validators, looked up by exact resource class
+        validators = {
+            Patient: self._validate_patient,
+            Condition: self._validate_condition,
+            Observation: self._validate_observation,
+            MedicationRequest: self._validate_medication_request,
+        }
 
         resource_types = set()
         for entry in bundle.entry:
@@ -73,15 +117,9 @@ class TestBundleValidation:
             assert entry.fullUrl is not None
             assert entry.fullUrl.startswith("urn:uuid:")
 
-            # Resource-specific validations
-            if isinstance(resource, Patient):
-                self._validate_patient(resource)
-            elif isinstance(resource, Condition):
-                self._validate_condition(resource)
-            elif isinstance(resource, Observation):
-                self._validate_observation(resource)
-            elif isinstance(resource, MedicationRequest):
-                self._validate_medication_request(resource)
+            validate = validators.get(type(resource))
+            if validate is not None:
+                validate(resource)
 
         # Mary should have specific resource types
         assert "Patient" in resource_types
@@ -91,143 +129,112 @@ class TestBundleValidation:
 
     def _validate_patient(self, patient: Patient):
         """Validate Patient resource."""
-        assert patient.dict()['resourceType'] == "Patient"
-        assert patient.name is not None and len(patient.name) > 0
-        assert patient.gender in ["male", "female", "other", "unknown"]
+        assert patient.resource_type == "Patient"
+        names = patient.name
+        gender = patient.gender
+        assert names is not None and len(names) > 0
+        assert gender in GENDERS
         assert patient.birthDate is not None
 
         # Mary specific validations
-        if patient.name[0].family == "Jones":
-            assert patient.gender == "female"
-            assert patient.name[0].given == ["Mary", "Elizabeth"]
+        name = names[0]
+        if name.family == "Jones":
+            assert gender == "female"
+            assert name.given == ["Mary", "Elizabeth"]
 
     def _validate_condition(self, condition: Condition):
         """Validate Condition resource."""
-        assert condition.dict()['resourceType'] == "Condition"
+        assert condition.resource_type == "Condition"
         assert condition.code is not None
-        assert condition.subject is not None
-        assert condition.subject.reference is not None
+        subject = condition.subject
+        assert subject is not None
+        assert subject.reference is not None
         assert condition.clinicalStatus is not None
         assert condition.verificationStatus is not None
 
     def _validate_observation(self, observation: Observation):
         """Validate Observation resource."""
-        assert observation.dict()['resourceType'] == "Observation"
-        assert observation.status in ["registered", "preliminary", "final", "amended", "corrected", "cancelled", "entered-in-error", "unknown"]
+        assert observation.resource_type == "Observation"
+        assert observation.status in OBSERVATION_STATUSES
         assert observation.code is not None
         assert observation.subject is not None
 
         # If it has a value, validate it
-        if observation.valueQuantity:
-            assert observation.valueQuantity.value is not None
-            assert observation.valueQuantity.unit is not None
+        quantity = observation.valueQuantity
+        if quantity:
+            assert quantity.value is not None
+            assert quantity.unit is not None
 
     def _validate_medication_request(self, med_request: MedicationRequest):
         """Validate MedicationRequest resource."""
-        assert med_request.dict()['resourceType'] == "MedicationRequest"
-        assert med_request.status in ["active", "on-hold", "cancelled", "completed", "entered-in-error", "stopped", "draft", "unknown"]
-        assert med_request.intent in ["proposal", "plan", "order", "original-order", "reflex-order", "filler-order", "instance-order", "option"]
+        assert med_request.resource_type == "MedicationRequest"
+        assert med_request.status in MEDICATION_REQUEST_STATUSES
+        assert med_request.intent in MEDICATION_REQUEST_INTENTS
         assert med_request.medication is not None
         assert med_request.subject is not None
 
-    def test_reference_integrity(self):
+    @pytest.mark.parametrize("persona", VALIDATED_PERSONAS)
+    def test_reference_integrity(self, persona_bundles, persona):
         """Test that references between resources are valid."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
+        bundle = persona_bundles[persona]
 
-        # Collect all resource URNs (transaction bundles use URNs)
-        resource_urns = set()
+        # One pass: find the patient URN and collect every subject reference
         patient_urn = None
-
+        subject_refs = set()
         for entry in bundle.entry:
             resource = entry.resource
-            # In transaction bundles, resources are identified by URNs
-            resource_urns.add(entry.fullUrl)
-
-            if isinstance(resource, Patient):
+            if type(resource) is Patient:
+                # In transaction bundles, resources are identified by URNs
                 patient_urn = entry.fullUrl
+            subject = getattr(resource, "subject", None)
+            if subject:
+                subject_refs.add(subject.reference)
 
         assert patient_urn is not None
+        # Subject references should all point at the patient URN
+        assert subject_refs <= {patient_urn}
 
-        # Check that all references point to existing resources
-        for entry in bundle.entry:
-            resource = entry.resource
-
-            # Check subject references
-            if hasattr(resource, "subject") and resource.subject:
-                ref = resource.subject.reference
-                # Should reference the patient URN in transaction bundles
-                assert ref == patient_urn
-
-    def test_persona_consistency(self):
+    def test_persona_consistency(self, persona_buckets):
         """Test that generated data is consistent with persona definition."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
-
-        # Find conditions
-        conditions = []
-        observations = []
-        medications = []
-
-        for entry in bundle.entry:
-            resource = entry.resource
-            if isinstance(resource, Condition):
-                conditions.append(resource)
-            elif isinstance(resource, Observation):
-                observations.append(resource)
-            elif isinstance(resource, MedicationRequest):
-                medications.append(resource)
+        buckets = persona_buckets["mary_diabetes"]
 
+        # Each check stops at the first matching coding across all resources.
         # Mary should have diabetes
-        diabetes_codes = ["44054006"]  # Type 2 diabetes SNOMED code
         has_diabetes = any(
-            any(coding.code in diabetes_codes for coding in cond.code.coding)
-            for cond in conditions
+            coding.code in DIABETES_CODES
+            for cond in buckets["Condition"]
+            for coding in cond.code.coding
         )
         assert has_diabetes, "Mary persona should have Type 2 diabetes condition"
 
         # Should have medications for diabetes
-        diabetes_meds = ["860975"]  # metformin RxNorm code
         has_diabetes_med = any(
-            any(coding.code in diabetes_meds for coding in med.medication.concept.coding)
-            for med in medications
+            coding.code in DIABETES_MEDS
+            for med in buckets["MedicationRequest"]
+            for coding in med.medication.concept.coding
         )
         assert has_diabetes_med, "Mary persona should have metformin prescription"
 
         # Should have HbA1c observations
-        hba1c_codes = ["4548-4"]  # HbA1c LOINC code
         has_hba1c = any(
-            any(coding.code in hba1c_codes for coding in obs.code.coding)
-            for obs in observations
+            coding.code in HBA1C_CODES
+            for obs in buckets["Observation"]
+            for coding in obs.code.coding
         )
         assert has_hba1c, "Mary persona should have HbA1c observations"
 
-    def test_multiple_personas(self):
+    def test_multiple_personas(self, persona_bundles):
         """Test that different personas generate different data."""
-        # Generate Mary
-        gen_mary = Generator.from_persona("mary_diabetes", seed=42)
-        bundle_mary = gen_mary.generate()
+        bundle_mary = persona_bundles["mary_diabetes"]
+        bundle_john = persona_bundles["john_asthma"]
 
-        # Generate John
-        gen_john = Generator.from_persona("john_asthma", seed=42)
-        bundle_john = gen_john.generate()
+        mary_entry = _patient_entry(bundle_mary)
+        john_entry = _patient_entry(bundle_john)
 
-        # Extract patient names
-        mary_patient = None
-        john_patient = None
-
-        for entry in bundle_mary.entry:
-            if isinstance(entry.resource, Patient):
-                mary_patient = entry.resource
-                break
-
-        for entry in bundle_john.entry:
-            if isinstance(entry.resource, Patient):
-                john_patient = entry.resource
-                break
-
-        assert mary_patient is not None
-        assert john_patient is not None
+        assert mary_entry is not None
+        assert john_entry is not None
+        mary_patient = mary_entry.resource
+        john_patient = john_entry.resource
 
         # Should have different demographics
         assert mary_patient.name[0].family == "Jones"
@@ -235,47 +242,34 @@ class TestBundleValidation:
         assert mary_patient.gender == "female"
         assert john_patient.gender == "male"
 
-    def test_deterministic_generation(self):
+    def test_deterministic_generation(self, persona_bundles):
         """Test that same seed produces same output."""
-        # Generate twice with same seed
-        gen1 = Generator.from_persona("mary_diabetes", seed=42)
-        bundle1 = gen1.generate()
-
-        gen2 = Generator.from_persona("mary_diabetes", seed=42)
-        bundle2 = gen2.generate()
+        # Regenerate the shared seed-42 mary bundle with the same seed
+        bundle1 = persona_bundles["mary_diabetes"]
+        bundle2 = Generator.from_persona("mary_diabetes", seed=42).generate()
 
         # Should produce identical bundles (except for timestamps)
         assert len(bundle1.entry) == len(bundle2.entry)
 
         # Check patient IDs are the same
-        patient1_id = None
-        patient2_id = None
-
-        for entry in bundle1.entry:
-            if isinstance(entry.resource, Patient):
-                patient1_id = entry.resource.id
-                break
+        assert _patient_entry(bundle1).resource.id == _patient_entry(bundle2).resource.id
 
-        for entry in bundle2.entry:
-            if isinstance(entry.resource, Patient):
-                patient2_id = entry.resource.id
-                break
+        # Every entry should get the same seeded URN and resource type, in order
+        def layout(bundle):
+            return [(e.fullUrl, e.resource.resource_type) for e in bundle.entry]
 
-        assert patient1_id == patient2_id
+        assert layout(bundle1) == layout(bundle2)
 
-    def test_bundle_can_be_parsed_by_fhir_resources(self):
+    @pytest.mark.parametrize("persona", VALIDATED_PERSONAS)
+    def test_bundle_can_be_parsed_by_fhir_resources(self, persona_bundles, persona_json, persona):
         """Test that generated bundle can be parsed back using fhir.resources."""
-        gen = Generator.from_persona("mary_diabetes", seed=42)
-        bundle = gen.generate()
-
-        # Serialize to JSON
-        json_str = bundle.json(indent=2)
+        bundle = persona_bundles[persona]
 
-        # Parse back using fhir.resources
-        parsed_bundle = Bundle.parse_raw(json_str)
+        # Parse the serialized bundle back using fhir.resources
+        parsed_bundle = Bundle.model_validate_json(persona_json[persona])
 
         assert parsed_bundle is not None
-        assert parsed_bundle.dict()['resourceType'] == "Bundle"
+        assert parsed_bundle.resource_type == "Bundle"
         assert len(parsed_bundle.entry) == len(bundle.entry)
 
         # Validate each entry can be parsed